@@ -0,0 +1,158 @@
+"""
+Shared pytest fixtures for the ContextSynth test suite.
+
+Sample files and project trees are built once per session with
+tmp_path_factory. They are read-only; tests that write to disk take a
+function-scoped tmp_path instead.
+"""
+
+import json
+
+import pytest
+
+from contextsynth import ContextSynth, DetailLevel, FileAnalyzer, ProjectAnalyzer
+
+
+SAMPLE_PY = '''
+def hello():
+    """Say hello."""
+    print("Hello")
+
+class MyClass:
+    """A class."""
+    pass
+
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# TODO: Add more functions
+'''
+
+SAMPLE_JS = '''
+function greet() {
+    console.log("Hello");
+}
+
+const add = (a, b) => a + b;
+
+class Calculator {
+    add(a, b) {
+        return a + b;
+    }
+}
+
+import React from 'react';
+const fs = require('fs');
+'''
+
+
+@pytest.fixture(scope="session")
+def sample_py_file(tmp_path_factory):
+    """A Python module with functions, a class, imports and a TODO."""
+    path = tmp_path_factory.mktemp("sample_py") / "test.py"
+    path.write_text(SAMPLE_PY)
+    return path
+
+
+@pytest.fixture(scope="session")
+def sample_py_summary(sample_py_file):
+    """sample_py_file analyzed once, for tests that only read the summary."""
+    return FileAnalyzer.analyze_file(sample_py_file)
+
+
+@pytest.fixture(scope="session")
+def sample_js_file(tmp_path_factory):
+    """A JavaScript module with a function, an arrow function and a class."""
+    path = tmp_path_factory.mktemp("sample_js") / "test.js"
+    path.write_text(SAMPLE_JS)
+    return path
+
+
+@pytest.fixture(scope="session")
+def synth():
+    """A default ContextSynth shared by tests that only read from it."""
+    return ContextSynth()
+
+
+@pytest.fixture(params=list(DetailLevel), ids=lambda level: level.value)
+def detail_synth(request):
+    """A ContextSynth at each detail level in turn."""
+    return ContextSynth(request.param)
+
+
+@pytest.fixture(scope="session")
+def node_project(tmp_path_factory):
+    """A Node.js project with a manifest, README and one source file."""
+    root = tmp_path_factory.mktemp("node")
+    (root / "package.json").write_text(json.dumps({
+        "name": "my-app",
+        "version": "2.0.0",
+        "description": "A sample application",
+        "dependencies": {
+            "express": "^4.18.0",
+            "react": "^18.0.0"
+        },
+        "devDependencies": {
+            "jest": "^29.0.0"
+        }
+    }))
+    (root / "README.md").write_text("# My App\n\nA sample application.")
+    
+    src = root / "src"
+    src.mkdir()
+    (src / "index.js").write_text('''
+import express from 'express';
+// TODO: Add routes
+const app = express();
+export default app;
+''')
+    return root
+
+
+@pytest.fixture(scope="session")
+def python_project(tmp_path_factory):
+    """A Python project with requirements.txt and a Flask entry point."""
+    root = tmp_path_factory.mktemp("python")
+    (root / "requirements.txt").write_text("flask>=2.0.0\nrequests\npytest")
+    (root / "main.py").write_text('''
+"""Main application module."""
+
+from flask import Flask
+
+# TODO: Add authentication
+
+app = Flask(__name__)
+
+def create_app():
+    """Create and configure the app."""
+    return app
+
+if __name__ == "__main__":
+    app.run()
+''')
+    return root
+
+
+@pytest.fixture(scope="session")
+def deep_project(tmp_path_factory):
+    """A Node.js project whose only source file is four directories down."""
+    root = tmp_path_factory.mktemp("deep")
+    deep = root / "a" / "b" / "c" / "d"
+    deep.mkdir(parents=True)
+    (deep / "deep.py").write_text("print('deep')")
+    (root / "package.json").write_text('{"name": "test"}')
+    return root
+
+
+@pytest.fixture(scope="session")
+def node_summary(node_project):
+    """node_project analyzed once and shared by read-only assertions."""
+    return ProjectAnalyzer.analyze_project(node_project)
+
+
+@pytest.fixture(scope="session")
+def python_summary(python_project):
+    """python_project analyzed once and shared by read-only assertions."""
+    return ProjectAnalyzer.analyze_project(python_project)
@@ -19,21 +19,188 @@ License: MIT
 Requested by: Copilot VSCode (Tool Request #25)
 """
 
+import io
 import os
 import re
+import sys
 import json
-import hashlib
+import heapq
+import pickle
+import time
+from collections import OrderedDict
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Tuple
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import List, Dict, Optional, Any, Set, Tuple, Iterable, Iterator, Union, Callable, TYPE_CHECKING
 from enum import Enum
 from pathlib import Path
 import ast
 import logging
+import mmap
+
+# Heavier modules are imported where they are used, so that --version,
+# --help and plain single-file runs don't pay for them
+if TYPE_CHECKING:
+    import argparse
+    import sqlite3
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+try:
+    import orjson  # Optional accelerator
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # Optional accelerator (google-re2)
+except ImportError:
+    re2 = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _compile_linear(pattern: bytes):
+    """
+    Compile a bytes pattern with RE2 when installed, else with re.
+    
+    RE2 matches in linear time, so comment scans can't stall on pathological
+    input such as minified bundles. It reads bytes patterns as UTF-8 by
+    default, where '.' skips invalid sequences; Latin-1 mode matches any
+    byte, as re does, so non-UTF-8 sources keep their markers. Other modules
+    named re2 (pyre2, fb-re2) lack this API and fall back to re.
+    """
+    if re2 is not None:
+        try:
+            options = re2.Options()
+            options.encoding = re2.Options.Encoding.LATIN1
+            return re2.compile(pattern, options)
+        except (AttributeError, TypeError):
+            pass
+    return re.compile(pattern)
+
 
 __version__ = "1.0.0"
 __author__ = "ATLAS (Team Brain)"
 
+# Summary objects are created per file/element; use __slots__ where supported
+# (Python 3.10+) to drop the per-instance __dict__
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Precompiled patterns. Source scans run on raw bytes; only the captured
+# text is decoded. A lone CR ends a line, as universal newlines read it.
+_COMMENT_MARKER_RE = _compile_linear(
+    rb'(?i)(?:#|//|/\*)\s*(TODO|FIXME|HACK|BUG|XXX)[:\s]*(.+?)(?:\*/|\r|\n|$)'
+)
+
+_PY_DEF_RE = re.compile(rb'(?:^|(?<=\r))def\s+(\w+)\s*\(', re.MULTILINE)
+_PY_CLASS_RE = re.compile(rb'(?:^|(?<=\r))class\s+(\w+)\s*[:\(]', re.MULTILINE)
+_PY_IMPORT_RE = re.compile(rb'(?:^|(?<=\r))(?:from\s+(\S+)\s+)?import\s+(\S+)', re.MULTILINE)
+
+_JS_FUNC_RES = [re.compile(p) for p in (
+    rb'function\s+(\w+)\s*\(',
+    rb'const\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>',
+    rb'const\s+(\w+)\s*=\s*function',
+    rb'(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s+(\w+)',
+)]
+_JS_CLASS_RE = re.compile(rb'class\s+(\w+)')
+_JS_IMPORT_RE = re.compile(rb'import\s+[^\r\n]*?from\s+[\'"]([^\'"]+)[\'"]')
+_JS_REQUIRE_RE = re.compile(rb'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)')
+
+# Fallback TOML scanning when tomllib is unavailable
+_TOML_NAME_RE = re.compile(r'name\s*=\s*["\']([^"\']+)["\']')
+_TOML_VERSION_RE = re.compile(r'version\s*=\s*["\']([^"\']+)["\']')
+_TOML_DESC_RE = re.compile(r'description\s*=\s*["\']([^"\']+)["\']')
+_REQUIREMENT_SPEC_RE = re.compile(r'[<>=!]')
+
+# Read size for streamed line counting and chunked mmap scans
+_CHUNK_SIZE = 1 << 20
+
+# Plain-text output layouts (filled with %-formatting)
+_FILE_TEXT_TEMPLATE = """File: %s
+Type: %s
+Size: %s bytes
+Lines: %d
+Elements: %d
+TODOs: %d
+Blockers: %d"""
+
+_FOLDER_TEXT_TEMPLATE = """Folder: %s
+Files: %d
+Lines: %s
+Types: %s"""
+
+_PROJECT_TEXT_TEMPLATE = """Project: %s
+Type: %s
+Version: %s
+Files: %d
+Lines: %s
+Technologies: %s
+Dependencies: %d
+TODOs: %d"""
+
+
+def _decode(data: bytes) -> str:
+    """Decode file bytes as UTF-8, dropping invalid sequences."""
+    return data.decode('utf-8', errors='ignore')
+
+
+def _count_breaks_between(data: "Union[bytes, mmap.mmap]", start: int, end: int) -> int:
+    """Count line breaks in data[start:end]; mmaps are counted a chunk at a time."""
+    if isinstance(data, bytes) and data.find(b'\r', start, end) == -1:
+        return data.count(b'\n', start, end)
+    
+    # mmap has no count(), and slicing it whole would copy the file
+    return _count_line_breaks(data[pos:min(pos + _CHUNK_SIZE, end)]
+                              for pos in range(start, end, _CHUNK_SIZE))
+
+
+def _count_line_breaks(chunks: Iterable[bytes]) -> int:
+    """
+    Count line breaks as universal newlines would read them.
+    
+    '\n', '\r\n' and a lone '\r' each end one line, including a '\r\n'
+    split across two chunks.
+    """
+    total = 0
+    prev_cr = False
+    for chunk in chunks:
+        total += chunk.count(b'\n')
+        if b'\r' in chunk:
+            total += chunk.count(b'\r') - chunk.count(b'\r\n')
+        if prev_cr and chunk[:1] == b'\n':
+            total -= 1
+        prev_cr = chunk[-1:] == b'\r'
+    return total
+
+
+def _read_file(filepath: Union[str, Path]) -> bytes:
+    """Read a whole file, or return b"" if it cannot be read."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+def _finditer_lines(pattern: "re.Pattern", data: "Union[bytes, mmap.mmap]") -> Iterator[Tuple["re.Match", int]]:
+    """
+    Yield (match, 1-based line number) for each match of pattern in data.
+    
+    Matches arrive in ascending order, so each line number only needs the
+    line breaks between the previous match and this one, counted in C.
+    """
+    line = 1
+    prev = 0
+    for match in pattern.finditer(data):
+        start = match.start()
+        line += _count_breaks_between(data, prev, start)
+        prev = start
+        yield match, line
+
 
 class DetailLevel(Enum):
     """Summary detail level."""
@@ -81,7 +248,7 @@ class ProjectType(Enum):
     GENERIC = "generic"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CodeElement:
     """A code element (function, class, etc.)."""
     name: str
@@ -91,7 +258,7 @@ class CodeElement:
     parameters: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FileSummary:
     """Summary of a single file."""
     path: str
@@ -104,6 +271,11 @@ class FileSummary:
     todos: List[str]
     blockers: List[str]
     dependencies: List[str]
+    mtime_ns: int = 0  # Source modification time when analyzed (0 = unknown)
+    name: str = field(init=False)  # Base name of path, for formatters
+    
+    def __post_init__(self) -> None:
+        self.name = os.path.basename(self.path)
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -129,7 +301,7 @@ class FileSummary:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FolderSummary:
     """Summary of a folder."""
     path: str
@@ -138,6 +310,10 @@ class FolderSummary:
     file_types: Dict[str, int]
     files: List[FileSummary]
     description: str
+    total_lines_str: str = field(init=False)  # total_lines with thousands separators
+    
+    def __post_init__(self) -> None:
+        self.total_lines_str = format(self.total_lines, ',')
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -151,7 +327,7 @@ class FolderSummary:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProjectSummary:
     """Summary of a project."""
     path: str
@@ -169,6 +345,10 @@ class ProjectSummary:
     todos: List[str]
     blockers: List[str]
     recent_changes: List[str]
+    total_lines_str: str = field(init=False)  # total_lines with thousands separators
+    
+    def __post_init__(self) -> None:
+        self.total_lines_str = format(self.total_lines, ',')
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -191,6 +371,186 @@ class ProjectSummary:
         }
 
 
+class AnalysisCache:
+    """
+    Persistent SQLite cache of file analyses.
+    
+    Entries are keyed by path, detail level, and a SHA-256 of the file's
+    content, so an unchanged file is never parsed twice. Writes are queued
+    and stored in one batch by flush().
+    """
+    
+    # Created in the home directory, which is only resolved when no
+    # db_path is given (it may not be resolvable at all, e.g. in containers)
+    DEFAULT_NAME = ".contextsynth_cache.db"
+    
+    # Bump whenever FileSummary/CodeElement change shape
+    SCHEMA_VERSION = 4
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            db_path: SQLite database file (default: ~/.contextsynth_cache.db)
+        """
+        self.db_path = Path(db_path) if db_path else Path.home() / self.DEFAULT_NAME
+        self._conn: Optional["sqlite3.Connection"] = None
+        self._pending: List[Tuple[str, bytes, float]] = []
+    
+    def __getstate__(self) -> Dict:
+        """Pickle without the connection so the cache can go to worker processes."""
+        return {"db_path": self.db_path, "_conn": None, "_pending": []}
+    
+    def _connect(self) -> "sqlite3.Connection":
+        """Open the database on first use."""
+        import sqlite3
+        
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, blob BLOB, created REAL)"
+            )
+        return self._conn
+    
+    def make_key(self, filepath: Path, detail_level: DetailLevel) -> Optional[str]:
+        """
+        Build the cache key for a file's current content.
+        
+        The file is hashed as a stream, so a cache hit never loads it into
+        memory. Returns None if the file cannot be read.
+        """
+        import hashlib
+        
+        try:
+            with open(filepath, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                    digest = hashlib.file_digest(f, hashlib.sha256).hexdigest()
+                else:
+                    hasher = hashlib.sha256()
+                    for chunk in iter(partial(f.read, _CHUNK_SIZE), b''):
+                        hasher.update(chunk)
+                    digest = hasher.hexdigest()
+        except OSError:
+            return None
+        return f"{self.SCHEMA_VERSION}:{detail_level.value}:{filepath}:{digest}"
+    
+    def get(self, key: str) -> Optional[FileSummary]:
+        """Return the cached summary for key, if any."""
+        try:
+            row = self._connect().execute(
+                "SELECT blob FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            return pickle.loads(row[0]) if row else None
+        except Exception:
+            # Unreadable database or a pickle from an incompatible version
+            return None
+    
+    def put(self, key: str, summary: FileSummary) -> None:
+        """Queue a summary for storage."""
+        blob = pickle.dumps(summary, pickle.HIGHEST_PROTOCOL)
+        self._pending.append((key, blob, time.time()))
+    
+    def take_pending(self) -> List[Tuple[str, bytes, float]]:
+        """Remove and return queued entries (used to ship them out of workers)."""
+        pending, self._pending = self._pending, []
+        return pending
+    
+    def add_pending(self, entries: List[Tuple[str, bytes, float]]) -> None:
+        """Queue entries produced elsewhere."""
+        self._pending.extend(entries)
+    
+    def flush(self) -> None:
+        """Store all queued entries in a single transaction."""
+        import sqlite3
+        
+        if not self._pending:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, blob, created) VALUES (?, ?, ?)",
+                    self._pending
+                )
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).warning("Could not write analysis cache: %s", e)
+        self._pending = []
+    
+    def close(self) -> None:
+        """Flush queued entries and close the database."""
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _PySummaryVisitor(ast.NodeVisitor):
+    """Collects classes, functions, and imports from a Python syntax tree."""
+    
+    def __init__(self, detail_level: DetailLevel):
+        self.detail_level = detail_level
+        self.collect_elements = detail_level != DetailLevel.BRIEF
+        self.detailed = detail_level == DetailLevel.DETAILED
+        self.elements: List[CodeElement] = []
+        self.imports: List[str] = []
+        self._imports_seen: Set[str] = set()
+        # Counted at every level; brief descriptions still report them
+        self.class_count = 0
+        self.function_count = 0
+    
+    def _add_import(self, module: str) -> None:
+        """Record an import once, keeping first-seen order."""
+        if module not in self._imports_seen:
+            self._imports_seen.add(module)
+            self.imports.append(module)
+    
+    def visit_FunctionDef(self, node: ast.AST) -> None:
+        self.function_count += 1
+        if self.collect_elements:
+            # Docstrings and parameters only appear in detailed summaries
+            docstring = ast.get_docstring(node) if self.detailed else None
+            self.elements.append(CodeElement(
+                name=node.name,
+                element_type="function",
+                line_number=node.lineno,
+                docstring=docstring[:100] if docstring else None,
+                parameters=[arg.arg for arg in node.args.args] if self.detailed else None
+            ))
+        # Function bodies hold local helpers and lazy imports; only a
+        # detailed summary goes looking for them
+        if self.detailed:
+            self.generic_visit(node)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.class_count += 1
+        if self.collect_elements:
+            docstring = ast.get_docstring(node) if self.detailed else None
+            self.elements.append(CodeElement(
+                name=node.name,
+                element_type="class",
+                line_number=node.lineno,
+                docstring=docstring[:100] if docstring else None
+            ))
+        self.generic_visit(node)  # Methods
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._add_import(alias.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self._add_import(node.module)
+    
+    def _skip(self, node: ast.AST) -> None:
+        """Simple statements cannot contain definitions; skip their expressions."""
+    
+    visit_Expr = visit_Assign = visit_AugAssign = visit_AnnAssign = _skip
+    visit_Return = visit_Delete = visit_Raise = visit_Assert = _skip
+
+
 class FileAnalyzer:
     """Analyzes individual files."""
     
@@ -222,6 +582,14 @@ class FileAnalyzer:
         ".txt": FileType.TEXT,
     }
     
+    EXTENSIONS = frozenset(EXTENSION_MAP)
+    
+    # Below this many files, process pool start-up costs more than it saves
+    PARALLEL_THRESHOLD = 8
+    
+    # Files larger than this (bytes) are memory-mapped and skip the AST parse
+    MMAP_THRESHOLD = 1 << 20
+    
     @classmethod
     def detect_file_type(cls, filepath: Path) -> FileType:
         """Detect file type from extension."""
@@ -229,41 +597,121 @@ class FileAnalyzer:
         return cls.EXTENSION_MAP.get(ext, FileType.UNKNOWN)
     
     @classmethod
-    def analyze_file(cls, filepath: Path, detail_level: DetailLevel = DetailLevel.STANDARD) -> FileSummary:
-        """Analyze a single file."""
+    def analyze_file(cls, filepath: Path, detail_level: DetailLevel = DetailLevel.STANDARD,
+                     cache: Optional[AnalysisCache] = None) -> FileSummary:
+        """
+        Analyze a single file.
+        
+        With a cache, a previous analysis of identical content is returned
+        as-is and new results are queued on the cache (call cache.flush()).
+        """
         file_type = cls.detect_file_type(filepath)
         
+        # Nothing is extracted from unknown types (often binaries), so
+        # don't read or hash them
+        if file_type == FileType.UNKNOWN:
+            try:
+                st = os.stat(filepath)
+                size_bytes, mtime_ns = st.st_size, st.st_mtime_ns
+            except OSError:
+                size_bytes = mtime_ns = 0
+            return cls._summarize(filepath, file_type, b"", size_bytes, detail_level, mtime_ns)
+        
+        # Check the cache before reading: a hit only costs a streamed hash
+        key = cache.make_key(filepath, detail_level) if cache is not None else None
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # Large files are memory-mapped rather than copied into a bytes object
+        data: Union[bytes, mmap.mmap] = b""
+        size_bytes = mtime_ns = 0
         try:
-            content = filepath.read_text(encoding='utf-8', errors='ignore')
-        except Exception:
-            content = ""
+            with open(filepath, 'rb') as f:
+                st = os.fstat(f.fileno())
+                size_bytes, mtime_ns = st.st_size, st.st_mtime_ns
+                if size_bytes > cls.MMAP_THRESHOLD:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = f.read()
+        except (OSError, ValueError):
+            pass
+        
+        try:
+            summary = cls._summarize(filepath, file_type, data, size_bytes, detail_level,
+                                     mtime_ns)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
         
-        lines = content.split('\n')
-        line_count = len(lines)
+        if key is not None:
+            cache.put(key, summary)
+        
+        return summary
+    
+    @classmethod
+    def analyze_bytes(cls, filepath: Path, data: bytes,
+                      detail_level: DetailLevel = DetailLevel.STANDARD) -> FileSummary:
+        """
+        Analyze file content that has already been read.
+        
+        Args:
+            filepath: Path the content came from (used for type and naming)
+            data: Raw file content
+            detail_level: Level of detail for summaries
+            
+        Returns:
+            FileSummary object, as analyze_file would build for that content
+        """
+        return cls._summarize(filepath, cls.detect_file_type(filepath), data, len(data),
+                              detail_level)
+    
+    @classmethod
+    def _summarize(cls, filepath: Path, file_type: FileType, data: Union[bytes, mmap.mmap],
+                   size_bytes: int, detail_level: DetailLevel,
+                   mtime_ns: int = 0) -> FileSummary:
+        """Build a FileSummary from a file's content."""
+        if file_type == FileType.UNKNOWN:
+            return FileSummary(
+                path=str(filepath),
+                file_type=file_type,
+                size_bytes=size_bytes,
+                line_count=0,
+                description=filepath.name,
+                key_elements=[],
+                imports=[],
+                todos=[],
+                blockers=[],
+                dependencies=[],
+                mtime_ns=mtime_ns
+            )
+        
+        large = size_bytes > cls.MMAP_THRESHOLD
+        chunks = (data[pos:pos + _CHUNK_SIZE] for pos in range(0, len(data), _CHUNK_SIZE))
+        line_count = _count_line_breaks(chunks) + 1
         
         # Extract elements based on file type
         if file_type == FileType.PYTHON:
-            key_elements, imports = cls._analyze_python(content)
+            if large:
+                # Parsing a huge module costs far more than it tells us
+                key_elements, imports, counts = cls._analyze_python_regex(data, detail_level)
+            else:
+                key_elements, imports, counts = cls._analyze_python(data, detail_level)
         elif file_type in [FileType.JAVASCRIPT, FileType.TYPESCRIPT]:
-            key_elements, imports = cls._analyze_javascript(content)
+            key_elements, imports, counts = cls._analyze_javascript(data, detail_level)
         else:
-            key_elements, imports = [], []
+            key_elements, imports, counts = [], [], (0, 0)
         
         # Extract TODOs and blockers
-        todos = cls._extract_todos(content)
-        blockers = cls._extract_blockers(content)
+        todos, blockers = cls._extract_comment_markers(data)
         
         # Generate description
-        description = cls._generate_description(filepath, file_type, key_elements, line_count)
-        
-        # Extract dependencies from content
-        dependencies = cls._extract_dependencies(content, file_type)
+        description = cls._generate_description(filepath, file_type, counts, line_count)
         
-        # Get file size safely
-        try:
-            size_bytes = filepath.stat().st_size
-        except Exception:
-            size_bytes = 0
+        # Extract dependencies from content (manifests this large are
+        # lockfiles or generated data, not worth parsing)
+        dependencies = [] if large else cls._extract_dependencies(data, file_type)
         
         return FileSummary(
             path=str(filepath),
@@ -271,145 +719,187 @@ class FileAnalyzer:
             size_bytes=size_bytes,
             line_count=line_count,
             description=description,
-            key_elements=key_elements if detail_level != DetailLevel.BRIEF else [],
+            key_elements=key_elements,
             imports=imports,
             todos=todos,
             blockers=blockers,
-            dependencies=dependencies
+            dependencies=dependencies,
+            mtime_ns=mtime_ns
         )
     
     @classmethod
-    def _analyze_python(cls, content: str) -> Tuple[List[CodeElement], List[str]]:
-        """Analyze Python code."""
-        elements = []
-        imports = []
+    def analyze_files(cls, filepaths: List[Path],
+                      detail_level: DetailLevel = DetailLevel.STANDARD,
+                      max_workers: Optional[int] = 1,
+                      cache: Optional[AnalysisCache] = None) -> List[FileSummary]:
+        """
+        Analyze many files, using worker processes when worthwhile.
         
-        try:
-            tree = ast.parse(content)
+        Args:
+            filepaths: Files to analyze
+            detail_level: Level of detail for summaries
+            max_workers: Worker process limit (1 = serial, the default; None = CPU count)
+            cache: Optional analysis cache; new results are flushed in one batch
             
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    docstring = ast.get_docstring(node)
-                    params = [arg.arg for arg in node.args.args]
-                    elements.append(CodeElement(
-                        name=node.name,
-                        element_type="function",
-                        line_number=node.lineno,
-                        docstring=docstring[:100] if docstring else None,
-                        parameters=params
-                    ))
-                elif isinstance(node, ast.ClassDef):
-                    docstring = ast.get_docstring(node)
-                    elements.append(CodeElement(
-                        name=node.name,
-                        element_type="class",
-                        line_number=node.lineno,
-                        docstring=docstring[:100] if docstring else None
-                    ))
-                elif isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
+        Returns:
+            FileSummary objects in the same order as filepaths
+        """
+        if cache is None:
+            analyze = partial(cls.analyze_file, detail_level=detail_level)
+            return cls._map_files(analyze, filepaths, max_workers)
+        
+        analyze = partial(_analyze_with_cache, detail_level=detail_level, cache=cache)
+        summaries = []
+        for summary, pending in cls._map_files(analyze, filepaths, max_workers):
+            summaries.append(summary)
+            cache.add_pending(pending)
+        cache.flush()
+        return summaries
+    
+    @classmethod
+    def count_lines(cls, filepath: Union[str, Path]) -> int:
+        """Count lines in a file without decoding it (0 if unreadable)."""
+        try:
+            with open(filepath, 'rb') as f:
+                return _count_line_breaks(iter(partial(f.read, _CHUNK_SIZE), b'')) + 1
+        except Exception:
+            return 0
+    
+    @classmethod
+    def _map_files(cls, func, filepaths: List[Any], max_workers: Optional[int]) -> List[Any]:
+        """Apply func to each file, in a process pool for larger batches."""
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(filepaths) < cls.PARALLEL_THRESHOLD:
+            return [func(f) for f in filepaths]
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        chunksize = max(1, min(16, len(filepaths) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, filepaths, chunksize=chunksize))
+    
+    @classmethod
+    def _analyze_python(cls, data: bytes,
+                        detail_level: DetailLevel = DetailLevel.STANDARD
+                        ) -> Tuple[List[CodeElement], List[str], Tuple[int, int]]:
+        """Analyze Python code into (elements, imports, (classes, functions))."""
+        try:
+            tree = ast.parse(_decode(data))
         except SyntaxError:
             # Fall back to regex-based analysis
-            elements, imports = cls._analyze_python_regex(content)
+            return cls._analyze_python_regex(data, detail_level)
         
-        return elements, imports
+        visitor = _PySummaryVisitor(detail_level)
+        visitor.visit(tree)
+        return visitor.elements, visitor.imports, (visitor.class_count, visitor.function_count)
     
     @classmethod
-    def _analyze_python_regex(cls, content: str) -> Tuple[List[CodeElement], List[str]]:
+    def _analyze_python_regex(cls, data: bytes,
+                              detail_level: DetailLevel = DetailLevel.STANDARD
+                              ) -> Tuple[List[CodeElement], List[str], Tuple[int, int]]:
         """Analyze Python code using regex (fallback)."""
         elements = []
         imports = []
         
-        # Find functions
-        for match in re.finditer(r'^def\s+(\w+)\s*\(', content, re.MULTILINE):
-            elements.append(CodeElement(
-                name=match.group(1),
-                element_type="function",
-                line_number=content[:match.start()].count('\n') + 1
-            ))
-        
-        # Find classes
-        for match in re.finditer(r'^class\s+(\w+)\s*[:\(]', content, re.MULTILINE):
-            elements.append(CodeElement(
-                name=match.group(1),
-                element_type="class",
-                line_number=content[:match.start()].count('\n') + 1
-            ))
+        if detail_level == DetailLevel.BRIEF:
+            # Brief descriptions only need the counts, not line numbers
+            counts = (sum(1 for _ in _PY_CLASS_RE.finditer(data)),
+                      sum(1 for _ in _PY_DEF_RE.finditer(data)))
+        else:
+            # Find functions
+            for match, line in _finditer_lines(_PY_DEF_RE, data):
+                elements.append(CodeElement(
+                    name=_decode(match.group(1)),
+                    element_type="function",
+                    line_number=line
+                ))
+            functions = len(elements)
+            
+            # Find classes
+            for match, line in _finditer_lines(_PY_CLASS_RE, data):
+                elements.append(CodeElement(
+                    name=_decode(match.group(1)),
+                    element_type="class",
+                    line_number=line
+                ))
+            counts = (len(elements) - functions, functions)
         
         # Find imports
-        for match in re.finditer(r'^(?:from\s+(\S+)\s+)?import\s+(\S+)', content, re.MULTILINE):
-            module = match.group(1) or match.group(2)
-            if module:
-                imports.append(module.split('.')[0])
+        modules = (match.group(1) or match.group(2) for match in _PY_IMPORT_RE.finditer(data))
+        imports.extend(_decode(module.split(b'.')[0]) for module in modules if module)
         
-        return elements, list(set(imports))
+        return elements, list(dict.fromkeys(imports)), counts
     
     @classmethod
-    def _analyze_javascript(cls, content: str) -> Tuple[List[CodeElement], List[str]]:
+    def _analyze_javascript(cls, data: bytes,
+                            detail_level: DetailLevel = DetailLevel.STANDARD
+                            ) -> Tuple[List[CodeElement], List[str], Tuple[int, int]]:
         """Analyze JavaScript/TypeScript code."""
         elements = []
         imports = []
         
-        # Find functions
-        patterns = [
-            r'function\s+(\w+)\s*\(',
-            r'const\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>',
-            r'const\s+(\w+)\s*=\s*function',
-            r'(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s+(\w+)',
-        ]
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, content):
-                name = match.group(1)
-                if name:
-                    elements.append(CodeElement(
-                        name=name,
-                        element_type="function",
-                        line_number=content[:match.start()].count('\n') + 1
-                    ))
-        
-        # Find classes
-        for match in re.finditer(r'class\s+(\w+)', content):
-            elements.append(CodeElement(
-                name=match.group(1),
-                element_type="class",
-                line_number=content[:match.start()].count('\n') + 1
-            ))
+        if detail_level == DetailLevel.BRIEF:
+            # Brief descriptions only need the counts, not line numbers
+            counts = (sum(1 for _ in _JS_CLASS_RE.finditer(data)),
+                      sum(1 for pattern in _JS_FUNC_RES
+                          for match in pattern.finditer(data) if match.group(1)))
+        else:
+            # Find functions
+            for pattern in _JS_FUNC_RES:
+                for match, line in _finditer_lines(pattern, data):
+                    name = match.group(1)
+                    if name:
+                        elements.append(CodeElement(
+                            name=_decode(name),
+                            element_type="function",
+                            line_number=line
+                        ))
+            functions = len(elements)
+            
+            # Find classes
+            for match, line in _finditer_lines(_JS_CLASS_RE, data):
+                elements.append(CodeElement(
+                    name=_decode(match.group(1)),
+                    element_type="class",
+                    line_number=line
+                ))
+            counts = (len(elements) - functions, functions)
         
         # Find imports
-        for match in re.finditer(r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]', content):
-            imports.append(match.group(1))
-        for match in re.finditer(r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', content):
-            imports.append(match.group(1))
+        imports.extend(_decode(match.group(1)) for match in _JS_IMPORT_RE.finditer(data))
+        imports.extend(_decode(match.group(1)) for match in _JS_REQUIRE_RE.finditer(data))
         
-        return elements, imports
+        return elements, list(dict.fromkeys(imports)), counts
     
     @classmethod
-    def _extract_todos(cls, content: str) -> List[str]:
-        """Extract TODO comments."""
+    def _extract_comment_markers(cls, data: bytes) -> Tuple[List[str], List[str]]:
+        """Extract TODO and FIXME/HACK/BUG/XXX comments in a single scan."""
         todos = []
-        for match in re.finditer(r'(?:#|//|/\*)\s*TODO[:\s]*(.+?)(?:\*/|\n|$)', content, re.IGNORECASE):
-            todos.append(match.group(1).strip()[:100])
-        return todos[:10]  # Limit to 10
+        blockers = []
+        for match in _COMMENT_MARKER_RE.finditer(data):
+            target = todos if match.group(1).upper() == b"TODO" else blockers
+            if len(target) < 10:  # Limit to 10 each
+                target.append(_decode(match.group(2)).strip()[:100])
+            elif len(todos) >= 10 and len(blockers) >= 10:
+                break
+        return todos, blockers
     
     @classmethod
-    def _extract_blockers(cls, content: str) -> List[str]:
+    def _extract_todos(cls, data: bytes) -> List[str]:
+        """Extract TODO comments."""
+        return cls._extract_comment_markers(data)[0]
+    
+    @classmethod
+    def _extract_blockers(cls, data: bytes) -> List[str]:
         """Extract FIXME/HACK/BUG comments."""
-        blockers = []
-        for match in re.finditer(r'(?:#|//|/\*)\s*(?:FIXME|HACK|BUG|XXX)[:\s]*(.+?)(?:\*/|\n|$)', content, re.IGNORECASE):
-            blockers.append(match.group(1).strip()[:100])
-        return blockers[:10]
+        return cls._extract_comment_markers(data)[1]
     
     @classmethod
-    def _extract_dependencies(cls, content: str, file_type: FileType) -> List[str]:
+    def _extract_dependencies(cls, content: bytes, file_type: FileType) -> List[str]:
         """Extract dependencies from file content."""
         if file_type == FileType.JSON_FILE:
             try:
-                data = json.loads(content)
+                data = _json_loads(content)
                 deps = []
                 if "dependencies" in data:
                     deps.extend(data["dependencies"].keys())
@@ -422,25 +912,31 @@ class FileAnalyzer:
     
     @classmethod
     def _generate_description(cls, filepath: Path, file_type: FileType, 
-                             elements: List[CodeElement], line_count: int) -> str:
-        """Generate a brief description."""
+                             counts: Tuple[int, int], line_count: int) -> str:
+        """Generate a brief description from (class, function) counts."""
         name = filepath.name
         
-        classes = [e for e in elements if e.element_type == "class"]
-        functions = [e for e in elements if e.element_type == "function"]
+        classes, functions = counts
         
         parts = [f"{name}"]
         
         if classes:
-            parts.append(f"{len(classes)} class(es)")
+            parts.append(f"{classes} class(es)")
         if functions:
-            parts.append(f"{len(functions)} function(s)")
+            parts.append(f"{functions} function(s)")
         
         parts.append(f"{line_count} lines")
         
         return " - ".join(parts)
 
 
+def _analyze_with_cache(filepath: Path, detail_level: DetailLevel,
+                        cache: AnalysisCache) -> Tuple[FileSummary, List[Tuple[str, bytes, float]]]:
+    """Analyze a file and return the cache entries it queued (worker-safe)."""
+    summary = FileAnalyzer.analyze_file(filepath, detail_level, cache)
+    return summary, cache.take_pending()
+
+
 class ProjectAnalyzer:
     """Analyzes projects."""
     
@@ -469,6 +965,12 @@ class ProjectAnalyzer:
         "main.rs",
     ]
     
+    # Manifests read once per analysis and shared between extractors
+    MANIFEST_FILES = ("package.json", "pyproject.toml", "Cargo.toml", "requirements.txt")
+    
+    # Concurrent blocking reads allowed by analyze_project_async
+    READ_CONCURRENCY = 64
+    
     # Directories to skip
     SKIP_DIRS = {
         "node_modules",
@@ -495,37 +997,114 @@ class ProjectAnalyzer:
     
     @classmethod
     def analyze_project(cls, project_path: Path, 
-                       detail_level: DetailLevel = DetailLevel.STANDARD) -> ProjectSummary:
+                       detail_level: DetailLevel = DetailLevel.STANDARD,
+                       max_workers: Optional[int] = 1,
+                       cache: Optional[AnalysisCache] = None) -> ProjectSummary:
         """Analyze a project."""
         project_type = cls.detect_project_type(project_path)
-        
-        # Get project metadata
-        name, description, version = cls._extract_metadata(project_path, project_type)
+        manifest = cls._load_project_manifest(project_path)
         
         # Collect all files
-        all_files = cls._collect_files(project_path)
+        all_files = list(cls._collect_files(project_path))
         
-        # Analyze key files
-        key_files = []
-        for filename in cls.KEY_FILES:
-            filepath = project_path / filename
-            if filepath.exists():
-                key_files.append(FileAnalyzer.analyze_file(filepath, detail_level))
+        # Read each file once: key files get a full analysis (which also
+        # counts their lines), everything else only needs a line count
+        key_paths, other_files = cls._split_key_files(project_path, all_files)
+        key_files = FileAnalyzer.analyze_files(
+            [Path(p) for p in key_paths], detail_level, max_workers, cache
+        )
         
-        # Count lines
-        total_lines = 0
-        for filepath in all_files:
-            try:
-                content = filepath.read_text(encoding='utf-8', errors='ignore')
-                total_lines += len(content.split('\n'))
-            except Exception:
-                pass
+        total_lines = sum(s.line_count for s in key_files)
+        # Counting is I/O-bound; a process pool would cost more than it saves
+        total_lines += sum(FileAnalyzer.count_lines(p) for p in other_files)
+        
+        return cls._build_summary(project_path, project_type, manifest, len(all_files),
+                                  key_files, total_lines)
+    
+    @classmethod
+    async def analyze_project_async(cls, project_path: Path,
+                                    detail_level: DetailLevel = DetailLevel.STANDARD,
+                                    max_workers: Optional[int] = 1) -> ProjectSummary:
+        """
+        Analyze a project, keeping many file reads in flight at once.
+        
+        Meant for high-latency filesystems (NFS, SMB) where each open/read
+        round-trip costs more than the analysis itself. Blocking I/O runs on
+        a thread pool, at most READ_CONCURRENCY operations at a time, and
+        key files are analyzed in worker processes when worthwhile.
+        
+        Args:
+            project_path: Path to project root
+            detail_level: Level of detail for summaries
+            max_workers: Worker process limit (1 = serial, the default; None = CPU count)
+            
+        Returns:
+            ProjectSummary object, the same as analyze_project produces
+        """
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(cls.READ_CONCURRENCY)
+        
+        with ThreadPoolExecutor(max_workers=cls.READ_CONCURRENCY) as io_pool:
+            async def run_io(func, *args):
+                async with limit:
+                    return await loop.run_in_executor(io_pool, func, *args)
+            
+            project_type = await run_io(cls.detect_project_type, project_path)
+            manifest = await run_io(cls._load_project_manifest, project_path)
+            all_files = await run_io(lambda: list(cls._collect_files(project_path)))
+            key_paths, other_files = cls._split_key_files(project_path, all_files)
+            
+            # Fan out every read; other files only need their lines counted
+            contents, line_counts = await asyncio.gather(
+                asyncio.gather(*(run_io(_read_file, p) for p in key_paths)),
+                asyncio.gather(*(run_io(FileAnalyzer.count_lines, p) for p in other_files)),
+            )
+            
+            # Analyze key files once their content is in memory
+            jobs = [partial(FileAnalyzer.analyze_bytes, Path(p), data, detail_level)
+                    for p, data in zip(key_paths, contents)]
+            workers = max_workers or os.cpu_count() or 1
+            if workers <= 1 or len(jobs) < FileAnalyzer.PARALLEL_THRESHOLD:
+                key_files = [job() for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as cpu_pool:
+                    key_files = list(await asyncio.gather(
+                        *(loop.run_in_executor(cpu_pool, job) for job in jobs)
+                    ))
+            
+            total_lines = sum(s.line_count for s in key_files) + sum(line_counts)
+            
+            # The remaining metadata lookups are small but still blocking I/O
+            return await run_io(cls._build_summary, project_path, project_type, manifest,
+                                len(all_files), key_files, total_lines)
+    
+    @classmethod
+    def _split_key_files(cls, project_path: Path,
+                         all_files: List[str]) -> Tuple[List[str], List[str]]:
+        """Split files into the key files present (in KEY_FILES order) and the rest."""
+        root = str(project_path)
+        key_paths = [os.path.join(root, filename) for filename in cls.KEY_FILES]
+        present = set(all_files).intersection(key_paths)
+        return ([p for p in key_paths if p in present],
+                [p for p in all_files if p not in present])
+    
+    @classmethod
+    def _build_summary(cls, project_path: Path, project_type: ProjectType,
+                       manifest: Dict[str, Any], file_count: int,
+                       key_files: List[FileSummary], total_lines: int) -> ProjectSummary:
+        """Assemble a ProjectSummary from the analyzed files and project metadata."""
+        # Get project metadata
+        name, description, version = cls._extract_metadata(project_path, project_type,
+                                                           manifest)
         
         # Extract dependencies
-        deps, dev_deps = cls._extract_all_dependencies(project_path, project_type)
+        deps, dev_deps = cls._extract_all_dependencies(project_path, project_type, manifest)
         
         # Extract technologies
-        technologies = cls._detect_technologies(project_path, project_type)
+        technologies = cls._detect_technologies(project_path, project_type, manifest)
         
         # Find entry points
         entry_points = cls._find_entry_points(project_path, project_type)
@@ -546,7 +1125,7 @@ class ProjectAnalyzer:
             name=name,
             description=description,
             version=version,
-            file_count=len(all_files),
+            file_count=file_count,
             total_lines=total_lines,
             main_technologies=technologies,
             dependencies=deps,
@@ -559,58 +1138,79 @@ class ProjectAnalyzer:
         )
     
     @classmethod
-    def _collect_files(cls, project_path: Path) -> List[Path]:
-        """Collect all relevant files."""
-        files = []
+    def _collect_files(cls, project_path: Path) -> Iterator[str]:
+        """Yield the paths (as strings) of all relevant files."""
+        stack = [str(project_path)]
         
-        for root, dirs, filenames in os.walk(project_path):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in cls.SKIP_DIRS]
-            
-            for filename in filenames:
-                filepath = Path(root) / filename
-                if filepath.suffix.lower() in FileAnalyzer.EXTENSION_MAP:
-                    files.append(filepath)
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            # Skip excluded directories and don't follow links
+                            if entry.name not in cls.SKIP_DIRS and not entry.is_symlink():
+                                stack.append(entry.path)
+                            continue
+                        
+                        stem, dot, ext = entry.name.rpartition('.')
+                        if dot and stem and '.' + ext.lower() in FileAnalyzer.EXTENSIONS:
+                            yield entry.path
+            except OSError:
+                continue
+    
+    @classmethod
+    def _load_project_manifest(cls, project_path: Path) -> Dict[str, Any]:
+        """
+        Read the project's manifest files once.
         
-        return files
+        package.json is stored parsed; TOML and requirements files are stored
+        as text. Missing or unparseable files are left out.
+        """
+        manifest: Dict[str, Any] = {}
+        for filename in cls.MANIFEST_FILES:
+            try:
+                data = (project_path / filename).read_bytes()
+            except OSError:
+                continue
+            if filename == "package.json":
+                try:
+                    manifest[filename] = _json_loads(data)
+                except ValueError:
+                    pass
+            else:
+                manifest[filename] = _decode(data)
+        return manifest
     
     @classmethod
-    def _extract_metadata(cls, project_path: Path, 
-                         project_type: ProjectType) -> Tuple[str, str, Optional[str]]:
+    def _extract_metadata(cls, project_path: Path, project_type: ProjectType,
+                          manifest: Dict[str, Any]) -> Tuple[str, str, Optional[str]]:
         """Extract project name, description, and version."""
         name = project_path.name
         description = ""
         version = None
         
         # Try package.json for Node projects
-        pkg_json = project_path / "package.json"
-        if pkg_json.exists():
+        data = manifest.get("package.json")
+        if data is not None:
             try:
-                data = json.loads(pkg_json.read_text())
                 name = data.get("name", name)
                 description = data.get("description", "")
                 version = data.get("version")
             except Exception:
                 pass
         
-        # Try pyproject.toml for Python projects
-        pyproject = project_path / "pyproject.toml"
-        if pyproject.exists():
-            try:
-                content = pyproject.read_text()
-                # Simple TOML parsing for name/version
-                name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-                version_match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
-                desc_match = re.search(r'description\s*=\s*["\']([^"\']+)["\']', content)
-                
-                if name_match:
-                    name = name_match.group(1)
-                if version_match:
-                    version = version_match.group(1)
-                if desc_match:
-                    description = desc_match.group(1)
-            except Exception:
-                pass
+        # Try pyproject.toml for Python projects, Cargo.toml for Rust
+        for filename, tables in (("pyproject.toml", ("project", "tool.poetry")),
+                                 ("Cargo.toml", ("package",))):
+            content = manifest.get(filename)
+            if content is not None:
+                try:
+                    meta = cls._toml_metadata(content, tables)
+                    name = meta.get("name", name)
+                    version = meta.get("version", version)
+                    description = meta.get("description", description)
+                except Exception:
+                    pass
         
         # Try README for description if not found
         if not description:
@@ -618,7 +1218,8 @@ class ProjectAnalyzer:
             if readme.exists():
                 try:
                     content = readme.read_text(encoding='utf-8', errors='ignore')
-                    lines = content.split('\n')
+                    # Only the first 10 lines are searched; leave the rest unsplit
+                    lines = content.split('\n', 10)
                     for line in lines[1:10]:  # Skip title, look in first 10 lines
                         line = line.strip()
                         if line and not line.startswith('#') and not line.startswith('!'):
@@ -630,32 +1231,54 @@ class ProjectAnalyzer:
         return name, description, version
     
     @classmethod
-    def _extract_all_dependencies(cls, project_path: Path, 
-                                  project_type: ProjectType) -> Tuple[List[str], List[str]]:
+    def _toml_metadata(cls, content: str, tables: Tuple[str, ...]) -> Dict[str, str]:
+        """Read name/version/description from the first matching TOML table."""
+        keys = ("name", "version", "description")
+        
+        if tomllib is None:
+            # Simple TOML scanning for name/version/description
+            meta = {}
+            for key, pattern in zip(keys, (_TOML_NAME_RE, _TOML_VERSION_RE, _TOML_DESC_RE)):
+                match = pattern.search(content)
+                if match:
+                    meta[key] = match.group(1)
+            return meta
+        
+        data = tomllib.loads(content)
+        for table in tables:
+            section: Any = data
+            for part in table.split('.'):
+                section = section.get(part, {}) if isinstance(section, dict) else {}
+            if section:
+                # Skip non-string values such as `version.workspace = true`
+                return {k: v for k, v in section.items() if k in keys and isinstance(v, str)}
+        return {}
+    
+    @classmethod
+    def _extract_all_dependencies(cls, project_path: Path, project_type: ProjectType,
+                                  manifest: Dict[str, Any]) -> Tuple[List[str], List[str]]:
         """Extract all dependencies."""
         deps = []
         dev_deps = []
         
         # Node.js
-        pkg_json = project_path / "package.json"
-        if pkg_json.exists():
+        data = manifest.get("package.json")
+        if data is not None:
             try:
-                data = json.loads(pkg_json.read_text())
                 deps = list(data.get("dependencies", {}).keys())
                 dev_deps = list(data.get("devDependencies", {}).keys())
             except Exception:
                 pass
         
         # Python
-        requirements = project_path / "requirements.txt"
-        if requirements.exists():
+        content = manifest.get("requirements.txt")
+        if content is not None:
             try:
-                content = requirements.read_text()
                 for line in content.split('\n'):
                     line = line.strip()
                     if line and not line.startswith('#'):
                         # Remove version specifier
-                        pkg = re.split(r'[<>=!]', line)[0].strip()
+                        pkg = _REQUIREMENT_SPEC_RE.split(line)[0].strip()
                         if pkg:
                             deps.append(pkg)
             except Exception:
@@ -664,8 +1287,8 @@ class ProjectAnalyzer:
         return deps[:30], dev_deps[:20]
     
     @classmethod
-    def _detect_technologies(cls, project_path: Path, 
-                            project_type: ProjectType) -> List[str]:
+    def _detect_technologies(cls, project_path: Path, project_type: ProjectType,
+                             manifest: Dict[str, Any]) -> List[str]:
         """Detect main technologies used."""
         technologies = []
         
@@ -689,10 +1312,9 @@ class ProjectAnalyzer:
                 technologies.extend(techs)
         
         # Check package.json dependencies
-        pkg_json = project_path / "package.json"
-        if pkg_json.exists():
+        data = manifest.get("package.json")
+        if data is not None:
             try:
-                data = json.loads(pkg_json.read_text())
                 all_deps = list(data.get("dependencies", {}).keys())
                 all_deps += list(data.get("devDependencies", {}).keys())
                 
@@ -709,9 +1331,7 @@ class ProjectAnalyzer:
                     "mongodb": "MongoDB",
                 }
                 
-                for dep in all_deps:
-                    if dep in tech_mapping:
-                        technologies.append(tech_mapping[dep])
+                technologies.extend(tech_mapping[dep] for dep in all_deps if dep in tech_mapping)
             except Exception:
                 pass
         
@@ -739,26 +1359,33 @@ class ProjectAnalyzer:
         
         return entry_points[:5]
     
+    @classmethod
+    def _in_git_repo(cls, project_path: Path) -> bool:
+        """Check for a .git entry in the project or any parent directory."""
+        path = project_path.resolve()
+        return any((p / ".git").exists() for p in (path, *path.parents))
+    
     @classmethod
     def _get_recent_changes(cls, project_path: Path) -> List[str]:
         """Get recent git changes if available."""
         import subprocess
         
+        # A few stat calls are far cheaper than spawning git to learn
+        # there is no repository
+        if not cls._in_git_repo(project_path):
+            return []
+        
         try:
             result = subprocess.run(
                 ["git", "log", "--oneline", "-n", "5"],
                 cwd=project_path,
                 capture_output=True,
-                text=True,
                 timeout=5
             )
             
             if result.returncode == 0:
-                changes = []
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        changes.append(line)
-                return changes
+                output = result.stdout.decode('utf-8', errors='replace')
+                return [line for line in output.strip().split('\n') if line]
         except Exception:
             pass
         
@@ -772,15 +1399,27 @@ class ContextSynth:
     Generates instant context summaries for files, folders, and projects.
     """
     
-    def __init__(self, detail_level: DetailLevel = DetailLevel.STANDARD):
+    # Rendered file summaries kept by format() (least recently used go first)
+    FORMAT_CACHE_SIZE = 256
+    
+    def __init__(self, detail_level: DetailLevel = DetailLevel.STANDARD,
+                 max_workers: Optional[int] = 1,
+                 cache: Optional[AnalysisCache] = None):
         """
         Initialize ContextSynth.
         
         Args:
             detail_level: Level of detail for summaries
+            max_workers: Worker processes for folder/project analysis
+                (1 = serial, the default; None = CPU count)
+            cache: Optional persistent cache of file analyses
         """
         self.detail_level = detail_level
+        self.max_workers = max_workers
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
+        # (summary, output) pairs memoized by format()
+        self._rendered: "OrderedDict[Tuple, Tuple[FileSummary, str]]" = OrderedDict()
     
     def summarize_file(self, filepath: Path) -> FileSummary:
         """
@@ -792,7 +1431,10 @@ class ContextSynth:
         Returns:
             FileSummary object
         """
-        return FileAnalyzer.analyze_file(filepath, self.detail_level)
+        summary = FileAnalyzer.analyze_file(filepath, self.detail_level, self.cache)
+        if self.cache is not None:
+            self.cache.flush()
+        return summary
     
     def summarize_folder(self, folder_path: Path) -> FolderSummary:
         """
@@ -804,20 +1446,20 @@ class ContextSynth:
         Returns:
             FolderSummary object
         """
-        files = []
         file_types: Dict[str, int] = {}
         total_lines = 0
         
-        for item in folder_path.iterdir():
-            if item.is_file():
-                file_type = FileAnalyzer.detect_file_type(item)
-                if file_type != FileType.UNKNOWN:
-                    summary = self.summarize_file(item)
-                    files.append(summary)
-                    
-                    type_name = file_type.value
-                    file_types[type_name] = file_types.get(type_name, 0) + 1
-                    total_lines += summary.line_count
+        candidates = [
+            item for item in folder_path.iterdir()
+            if item.is_file() and FileAnalyzer.detect_file_type(item) != FileType.UNKNOWN
+        ]
+        files = FileAnalyzer.analyze_files(candidates, self.detail_level,
+                                           self.max_workers, self.cache)
+        
+        for summary in files:
+            type_name = summary.file_type.value
+            file_types[type_name] = file_types.get(type_name, 0) + 1
+            total_lines += summary.line_count
         
         description = f"{len(files)} files in {folder_path.name}"
         if file_types:
@@ -843,24 +1485,74 @@ class ContextSynth:
         Returns:
             ProjectSummary object
         """
-        return ProjectAnalyzer.analyze_project(project_path, self.detail_level)
+        return ProjectAnalyzer.analyze_project(project_path, self.detail_level,
+                                               self.max_workers, self.cache)
+    
+    def format(self, summary: Any, output_format: OutputFormat) -> str:
+        """
+        Format a summary, reusing earlier output for unchanged files.
+        
+        File summaries with a known modification time are memoized by
+        (path, mtime_ns, size, format, detail level). A hit is only reused if
+        it was rendered from an equal summary, since content can change
+        without moving the mtime (coarse timestamps, cp -p, two edits in
+        one tick).
+        
+        Args:
+            summary: FileSummary, FolderSummary or ProjectSummary
+            output_format: Output format
+            
+        Returns:
+            Formatted summary
+        """
+        formatter = _FORMATTERS[output_format]
+        if not isinstance(summary, FileSummary) or not summary.mtime_ns:
+            return formatter(self, summary)
+        
+        key = (summary.path, summary.mtime_ns, summary.size_bytes, output_format,
+               self.detail_level)
+        entry = self._rendered.get(key)
+        if entry is not None and entry[0] == summary:
+            self._rendered.move_to_end(key)
+            return entry[1]
+        
+        rendered = formatter(self, summary)
+        self._rendered[key] = (summary, rendered)
+        self._rendered.move_to_end(key)
+        if len(self._rendered) > self.FORMAT_CACHE_SIZE:
+            self._rendered.popitem(last=False)
+        return rendered
     
     def format_markdown(self, summary: Any) -> str:
         """Format summary as markdown."""
+        buf = io.StringIO()
+        self.write_markdown(summary, buf.write)
+        return buf.getvalue()
+    
+    def write_markdown(self, summary: Any, write: Callable[[str], Any]) -> None:
+        """
+        Stream a summary as markdown, one section at a time.
+        
+        Args:
+            summary: FileSummary, FolderSummary or ProjectSummary
+            write: Called with each successive chunk of markdown text
+        """
         if isinstance(summary, FileSummary):
-            return self._format_file_markdown(summary)
+            self._write_file_markdown(summary, write)
         elif isinstance(summary, FolderSummary):
-            return self._format_folder_markdown(summary)
+            self._write_folder_markdown(summary, write)
         elif isinstance(summary, ProjectSummary):
-            return self._format_project_markdown(summary)
+            self._write_project_markdown(summary, write)
         else:
-            return str(summary)
+            write(str(summary))
     
     def format_json(self, summary: Any) -> str:
         """Format summary as JSON."""
-        if hasattr(summary, 'to_dict'):
-            return json.dumps(summary.to_dict(), indent=2, ensure_ascii=False)
-        return json.dumps(summary, indent=2, ensure_ascii=False)
+        data = summary.to_dict() if hasattr(summary, 'to_dict') else summary
+        if orjson is not None:
+            # Same layout as json.dumps(indent=2), encoded in C
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        return json.dumps(data, indent=2, ensure_ascii=False)
     
     def format_text(self, summary: Any) -> str:
         """Format summary as plain text."""
@@ -873,269 +1565,309 @@ class ContextSynth:
         else:
             return str(summary)
     
-    def _format_file_markdown(self, summary: FileSummary) -> str:
-        """Format file summary as markdown."""
-        lines = [
-            f"# File Summary: {Path(summary.path).name}",
-            "",
-            f"**Path:** `{summary.path}`",
-            f"**Type:** {summary.file_type.value}",
-            f"**Size:** {summary.size_bytes:,} bytes",
-            f"**Lines:** {summary.line_count}",
-            "",
-        ]
-        
+    def _write_file_markdown(self, summary: FileSummary, w: Callable[[str], Any]) -> None:
+        """Write file summary as markdown."""
+        w(f"# File Summary: {summary.name}\n\n"
+          f"**Path:** `{summary.path}`\n"
+          f"**Type:** {summary.file_type.value}\n"
+          f"**Size:** {summary.size_bytes:,} bytes\n"
+          f"**Lines:** {summary.line_count}\n")
+        
+        # Each section opens with the blank line that separates it
         if summary.key_elements:
-            lines.append("## Key Elements")
-            lines.append("")
+            w("\n## Key Elements\n\n")
             for elem in summary.key_elements[:10]:
-                lines.append(f"- **{elem.element_type}** `{elem.name}` (line {elem.line_number})")
+                w(f"- **{elem.element_type}** `{elem.name}` (line {elem.line_number})\n")
                 if elem.docstring:
-                    lines.append(f"  - {elem.docstring}")
-            lines.append("")
+                    w(f"  - {elem.docstring}\n")
         
         if summary.imports:
-            lines.append("## Imports")
-            lines.append("")
-            lines.append(", ".join(f"`{i}`" for i in summary.imports[:10]))
-            lines.append("")
+            w("\n## Imports\n\n")
+            w("`%s`\n" % "`, `".join(summary.imports[:10]))
         
         if summary.todos:
-            lines.append("## TODOs")
-            lines.append("")
-            for todo in summary.todos:
-                lines.append(f"- [ ] {todo}")
-            lines.append("")
+            w("\n## TODOs\n\n")
+            w("\n".join(f"- [ ] {todo}" for todo in summary.todos))
+            w("\n")
         
         if summary.blockers:
-            lines.append("## Blockers")
-            lines.append("")
-            for blocker in summary.blockers:
-                lines.append(f"- [!] {blocker}")
-            lines.append("")
-        
-        return "\n".join(lines)
-    
-    def _format_folder_markdown(self, summary: FolderSummary) -> str:
-        """Format folder summary as markdown."""
-        lines = [
-            f"# Folder Summary: {Path(summary.path).name}",
-            "",
-            f"**Path:** `{summary.path}`",
-            f"**Files:** {summary.file_count}",
-            f"**Total Lines:** {summary.total_lines:,}",
-            "",
-        ]
+            w("\n## Blockers\n\n")
+            w("\n".join(f"- [!] {blocker}" for blocker in summary.blockers))
+            w("\n")
+    
+    def _write_folder_markdown(self, summary: FolderSummary, w: Callable[[str], Any]) -> None:
+        """Write folder summary as markdown."""
+        w(f"# Folder Summary: {os.path.basename(summary.path)}\n\n"
+          f"**Path:** `{summary.path}`\n"
+          f"**Files:** {summary.file_count}\n"
+          f"**Total Lines:** {summary.total_lines_str}\n")
         
         if summary.file_types:
-            lines.append("## File Types")
-            lines.append("")
-            for ftype, count in sorted(summary.file_types.items(), key=lambda x: -x[1]):
-                lines.append(f"- {ftype}: {count}")
-            lines.append("")
+            w("\n## File Types\n\n")
+            types = heapq.nlargest(len(summary.file_types), summary.file_types.items(),
+                                   key=itemgetter(1))
+            w("\n".join(f"- {ftype}: {count}" for ftype, count in types))
+            w("\n")
         
         if summary.files:
-            lines.append("## Files")
-            lines.append("")
-            for file in summary.files[:10]:
-                lines.append(f"- `{Path(file.path).name}` - {file.description}")
-            lines.append("")
-        
-        return "\n".join(lines)
-    
-    def _format_project_markdown(self, summary: ProjectSummary) -> str:
-        """Format project summary as markdown."""
-        lines = [
-            f"# Project Summary: {summary.name}",
-            "",
-            f"**Type:** {summary.project_type.value}",
-        ]
-        
-        if summary.version:
-            lines.append(f"**Version:** {summary.version}")
-        
-        lines.extend([
-            f"**Files:** {summary.file_count}",
-            f"**Total Lines:** {summary.total_lines:,}",
-            "",
-        ])
+            w("\n## Files\n\n")
+            w("\n".join(f"- `{file.name}` - {file.description}"
+                        for file in summary.files[:10]))
+            w("\n")
+    
+    def _write_project_markdown(self, summary: ProjectSummary, w: Callable[[str], Any]) -> None:
+        """Write project summary as markdown."""
+        version = f"**Version:** {summary.version}\n" if summary.version else ""
+        w(f"# Project Summary: {summary.name}\n\n"
+          f"**Type:** {summary.project_type.value}\n"
+          f"{version}"
+          f"**Files:** {summary.file_count}\n"
+          f"**Total Lines:** {summary.total_lines_str}\n")
         
         if summary.description:
-            lines.append(f"> {summary.description}")
-            lines.append("")
+            w(f"\n> {summary.description}\n")
         
         if summary.main_technologies:
-            lines.append("## Technologies")
-            lines.append("")
-            lines.append(", ".join(f"**{t}**" for t in summary.main_technologies))
-            lines.append("")
+            w("\n## Technologies\n\n")
+            w("**%s**\n" % "**, **".join(summary.main_technologies))
         
         if summary.entry_points:
-            lines.append("## Entry Points")
-            lines.append("")
-            for entry in summary.entry_points:
-                lines.append(f"- `{entry}`")
-            lines.append("")
+            w("\n## Entry Points\n\n")
+            w("\n".join(f"- `{entry}`" for entry in summary.entry_points))
+            w("\n")
         
         if summary.dependencies:
-            lines.append("## Dependencies")
-            lines.append("")
-            lines.append(", ".join(f"`{d}`" for d in summary.dependencies[:15]))
-            lines.append("")
+            w("\n## Dependencies\n\n")
+            w("`%s`\n" % "`, `".join(summary.dependencies[:15]))
         
         if summary.key_files:
-            lines.append("## Key Files")
-            lines.append("")
-            for file in summary.key_files[:5]:
-                lines.append(f"### {Path(file.path).name}")
-                lines.append(f"{file.description}")
-                lines.append("")
+            w("\n## Key Files\n\n")
+            w("\n\n".join(f"### {file.name}\n{file.description}"
+                          for file in summary.key_files[:5]))
+            w("\n")
         
         if summary.todos:
-            lines.append("## TODOs")
-            lines.append("")
-            for todo in summary.todos[:5]:
-                lines.append(f"- [ ] {todo}")
-            lines.append("")
+            w("\n## TODOs\n\n")
+            w("\n".join(f"- [ ] {todo}" for todo in summary.todos[:5]))
+            w("\n")
         
         if summary.blockers:
-            lines.append("## Blockers")
-            lines.append("")
-            for blocker in summary.blockers[:5]:
-                lines.append(f"- [!] {blocker}")
-            lines.append("")
+            w("\n## Blockers\n\n")
+            w("\n".join(f"- [!] {blocker}" for blocker in summary.blockers[:5]))
+            w("\n")
         
         if summary.recent_changes:
-            lines.append("## Recent Changes")
-            lines.append("")
-            for change in summary.recent_changes:
-                lines.append(f"- {change}")
-            lines.append("")
-        
-        return "\n".join(lines)
+            w("\n## Recent Changes\n\n")
+            w("\n".join(f"- {change}" for change in summary.recent_changes))
+            w("\n")
     
     def _format_file_text(self, summary: FileSummary) -> str:
         """Format file summary as text."""
-        return f"""File: {summary.path}
-Type: {summary.file_type.value}
-Size: {summary.size_bytes:,} bytes
-Lines: {summary.line_count}
-Elements: {len(summary.key_elements)}
-TODOs: {len(summary.todos)}
-Blockers: {len(summary.blockers)}"""
+        return _FILE_TEXT_TEMPLATE % (
+            summary.path,
+            summary.file_type.value,
+            format(summary.size_bytes, ','),
+            summary.line_count,
+            len(summary.key_elements),
+            len(summary.todos),
+            len(summary.blockers),
+        )
     
     def _format_folder_text(self, summary: FolderSummary) -> str:
         """Format folder summary as text."""
-        return f"""Folder: {summary.path}
-Files: {summary.file_count}
-Lines: {summary.total_lines:,}
-Types: {', '.join(f'{k}:{v}' for k, v in summary.file_types.items())}"""
+        return _FOLDER_TEXT_TEMPLATE % (
+            summary.path,
+            summary.file_count,
+            summary.total_lines_str,
+            ', '.join(f'{k}:{v}' for k, v in summary.file_types.items()),
+        )
     
     def _format_project_text(self, summary: ProjectSummary) -> str:
         """Format project summary as text."""
-        return f"""Project: {summary.name}
-Type: {summary.project_type.value}
-Version: {summary.version or 'unknown'}
-Files: {summary.file_count}
-Lines: {summary.total_lines:,}
-Technologies: {', '.join(summary.main_technologies)}
-Dependencies: {len(summary.dependencies)}
-TODOs: {len(summary.todos)}"""
+        return _PROJECT_TEXT_TEMPLATE % (
+            summary.name,
+            summary.project_type.value,
+            summary.version or 'unknown',
+            summary.file_count,
+            summary.total_lines_str,
+            ', '.join(summary.main_technologies),
+            len(summary.dependencies),
+            len(summary.todos),
+        )
 
 
-def main():
-    """CLI entry point."""
+class _GatheredFileWriter:
+    """
+    Write text to a file in batches of chunks, one os.writev call per batch.
+    
+    Used for streamed CLI output so that many small markdown sections reach
+    the file in a handful of system calls. Requires os.writev (POSIX).
+    """
+    
+    BATCH_SIZE = 64
+    
+    def __init__(self, path: str):
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        self.chunks: List[bytes] = []
+    
+    def write(self, text: str) -> None:
+        """Queue text, writing out the batch once it is full."""
+        if text:
+            self.chunks.append(text.encode('utf-8'))
+            if len(self.chunks) >= self.BATCH_SIZE:
+                self.flush()
+    
+    def flush(self) -> None:
+        """Write all queued chunks, resuming after short writes."""
+        chunks = self.chunks
+        self.chunks = []
+        while chunks:
+            written = os.writev(self.fd, chunks)
+            done = 0
+            while done < len(chunks) and written >= len(chunks[done]):
+                written -= len(chunks[done])
+                done += 1
+            del chunks[:done]
+            if written:
+                chunks[0] = chunks[0][written:]
+    
+    def close(self) -> None:
+        """Flush remaining chunks and close the file."""
+        try:
+            self.flush()
+        finally:
+            os.close(self.fd)
+    
+    def __enter__(self) -> "_GatheredFileWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# CLI --detail and --format choices
+_DETAIL_MAP = {
+    "brief": DetailLevel.BRIEF,
+    "standard": DetailLevel.STANDARD,
+    "detailed": DetailLevel.DETAILED,
+}
+_FORMATTERS = {
+    OutputFormat.MARKDOWN: ContextSynth.format_markdown,
+    OutputFormat.JSON: ContextSynth.format_json,
+    OutputFormat.TEXT: ContextSynth.format_text,
+}
+
+
+@lru_cache(maxsize=None)
+def _build_parser() -> "argparse.ArgumentParser":
+    """Build the CLI parser once; later calls in the same process reuse it."""
     import argparse
     
     parser = argparse.ArgumentParser(
         description="ContextSynth - Instant Context Summarizer"
     )
     
+    # Options shared by every command. Declaring them once on a parent
+    # parser guarantees each subcommand's namespace carries them.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", "-f", choices=["markdown", "json", "text"],
+                        default="markdown", help="Output format")
+    common.add_argument("--detail", "-d", choices=["brief", "standard", "detailed"],
+                        default="standard", help="Detail level")
+    common.add_argument("--output", "-o", help="Output file")
+    common.add_argument("--cache", action="store_true",
+                        help="Reuse cached analyses of unchanged files")
+    
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
     # File command
-    file_parser = subparsers.add_parser("file", help="Summarize a file")
+    file_parser = subparsers.add_parser("file", parents=[common],
+                                        help="Summarize a file")
+    file_parser.set_defaults(summarize=ContextSynth.summarize_file, label="File",
+                             jobs=1)
     file_parser.add_argument("path", help="Path to file")
-    file_parser.add_argument("--format", "-f", choices=["markdown", "json", "text"],
-                            default="markdown", help="Output format")
-    file_parser.add_argument("--output", "-o", help="Output file")
     
     # Folder command
-    folder_parser = subparsers.add_parser("folder", help="Summarize a folder")
+    folder_parser = subparsers.add_parser("folder", parents=[common],
+                                          help="Summarize a folder")
+    folder_parser.set_defaults(summarize=ContextSynth.summarize_folder, label="Folder")
     folder_parser.add_argument("path", help="Path to folder")
-    folder_parser.add_argument("--format", "-f", choices=["markdown", "json", "text"],
-                              default="markdown", help="Output format")
-    folder_parser.add_argument("--output", "-o", help="Output file")
+    folder_parser.add_argument("--jobs", "-j", type=int, default=1,
+                              help="Worker processes (default: 1; 0 = CPU count)")
     
     # Project command
-    project_parser = subparsers.add_parser("project", help="Summarize a project")
+    project_parser = subparsers.add_parser("project", parents=[common],
+                                           help="Summarize a project")
+    # Only the few key files get a full analysis, too few for worker processes
+    project_parser.set_defaults(summarize=ContextSynth.summarize_project, label="Project",
+                                jobs=1)
     project_parser.add_argument("path", nargs="?", default=".", help="Path to project")
-    project_parser.add_argument("--format", "-f", choices=["markdown", "json", "text"],
-                               default="markdown", help="Output format")
-    project_parser.add_argument("--detail", "-d", choices=["brief", "standard", "detailed"],
-                               default="standard", help="Detail level")
-    project_parser.add_argument("--output", "-o", help="Output file")
     
     # Version
     parser.add_argument("--version", "-v", action="version", 
                        version=f"ContextSynth {__version__}")
     
+    return parser
+
+
+def main():
+    """CLI entry point."""
+    parser = _build_parser()
     args = parser.parse_args()
     
-    # Set detail level
-    detail_map = {
-        "brief": DetailLevel.BRIEF,
-        "standard": DetailLevel.STANDARD,
-        "detailed": DetailLevel.DETAILED
-    }
-    detail_level = detail_map.get(getattr(args, 'detail', 'standard'), DetailLevel.STANDARD)
-    
-    synth = ContextSynth(detail_level)
-    
-    if args.command == "file":
-        filepath = Path(args.path)
-        if not filepath.exists():
-            print(f"Error: File not found: {filepath}")
-            exit(1)
-        
-        summary = synth.summarize_file(filepath)
-        
-    elif args.command == "folder":
-        folder_path = Path(args.path)
-        if not folder_path.exists():
-            print(f"Error: Folder not found: {folder_path}")
-            exit(1)
-        
-        summary = synth.summarize_folder(folder_path)
-        
-    elif args.command == "project":
-        project_path = Path(args.path)
-        if not project_path.exists():
-            print(f"Error: Project not found: {project_path}")
-            exit(1)
-        
-        summary = synth.summarize_project(project_path)
-        
-    else:
+    if args.command is None:
         parser.print_help()
-        exit(0)
+        return
     
-    # Format output
-    format_map = {
-        "markdown": synth.format_markdown,
-        "json": synth.format_json,
-        "text": synth.format_text
-    }
+    detail_level = _DETAIL_MAP[args.detail]
+    cache = AnalysisCache() if args.cache else None
+    synth = ContextSynth(detail_level, args.jobs or None, cache)
+    
+    # Each subparser carries its summarize method (set_defaults), and formats
+    # go through ContextSynth.format, so dispatch needs no string building.
+    # No existence pre-check: the summarizer opens the path anyway. Missing
+    # files and projects summarize as empty rather than failing, so only an
+    # empty result needs a second look.
+    path = Path(args.path)
+    try:
+        summary = args.summarize(synth, path)
+        if args.command == "file":
+            empty = summary.size_bytes == 0
+        else:
+            empty = summary.file_count == 0
+        if empty and not path.exists():
+            raise FileNotFoundError(path)
+    except FileNotFoundError:
+        print(f"Error: {args.label} not found: {path}")
+        raise SystemExit(1)
     
-    output = format_map[args.format](summary)
+    formatter = partial(synth.format, output_format=OutputFormat(args.format))
     
     # Write output
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(output)
+        if args.format == "markdown" and hasattr(os, "writev"):
+            # Stream sections to the file in gathered writes, without
+            # building the whole document first
+            with _GatheredFileWriter(args.output) as out:
+                synth.write_markdown(summary, out.write)
+        elif args.format == "json" and orjson is not None:
+            # orjson already produces UTF-8 bytes; write them as-is
+            with open(args.output, 'wb') as f:
+                f.write(orjson.dumps(summary.to_dict(), option=orjson.OPT_INDENT_2))
+        elif args.format == "json":
+            # json.dump streams encoder chunks into the file rather than
+            # building the whole document as one string
+            with open(args.output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                json.dump(summary.to_dict(), f, indent=2, ensure_ascii=False)
+        else:
+            # A 1 MiB buffer keeps large outputs to a few write() calls
+            with open(args.output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(formatter(summary))
         print(f"Summary saved to {args.output}")
     else:
-        print(output)
+        # Skip print()'s sep/end handling for what can be megabytes of text
+        sys.stdout.write(formatter(summary))
+        sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
@@ -11,15 +11,21 @@ Tests all functionality including:
 
 Target: 70+ tests with 100% pass rate
 
+Run with: python -m pytest
+
 Author: ATLAS (Team Brain)
 """
 
-import unittest
-import tempfile
+import asyncio
 import json
 import os
+import pickle
+import re
+import sys
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+
+import pytest
 
 from contextsynth import (
     DetailLevel,
@@ -32,76 +38,40 @@ from contextsynth import (
     ProjectSummary,
     FileAnalyzer,
     ProjectAnalyzer,
+    AnalysisCache,
     ContextSynth,
+    _GatheredFileWriter,
+    _build_parser,
+    main,
     __version__
 )
 
 
-class TestDetailLevel(unittest.TestCase):
-    """Tests for DetailLevel enum."""
-    
-    def test_brief_value(self):
-        """Test brief level."""
-        self.assertEqual(DetailLevel.BRIEF.value, "brief")
-    
-    def test_standard_value(self):
-        """Test standard level."""
-        self.assertEqual(DetailLevel.STANDARD.value, "standard")
-    
-    def test_detailed_value(self):
-        """Test detailed level."""
-        self.assertEqual(DetailLevel.DETAILED.value, "detailed")
+# One marker per comment dialect: #, // and /* */
+TODO_BLOB = b"# TODO: Fix this bug\n// TODO: Add feature\n/* TODO: Refactor */\n"
+BLOCKER_BLOB = b"# FIXME: This is broken\n// HACK: Temporary workaround\n/* BUG: Known issue */\n"
 
 
-class TestOutputFormat(unittest.TestCase):
-    """Tests for OutputFormat enum."""
-    
-    def test_markdown_value(self):
-        """Test markdown format."""
-        self.assertEqual(OutputFormat.MARKDOWN.value, "markdown")
-    
-    def test_json_value(self):
-        """Test JSON format."""
-        self.assertEqual(OutputFormat.JSON.value, "json")
-    
-    def test_text_value(self):
-        """Test text format."""
-        self.assertEqual(OutputFormat.TEXT.value, "text")
-
-
-class TestFileType(unittest.TestCase):
-    """Tests for FileType enum."""
-    
-    def test_python_value(self):
-        """Test Python type."""
-        self.assertEqual(FileType.PYTHON.value, "python")
-    
-    def test_javascript_value(self):
-        """Test JavaScript type."""
-        self.assertEqual(FileType.JAVASCRIPT.value, "javascript")
-    
-    def test_unknown_value(self):
-        """Test unknown type."""
-        self.assertEqual(FileType.UNKNOWN.value, "unknown")
+@pytest.mark.parametrize("member,expected", [
+    (DetailLevel.BRIEF, "brief"),
+    (DetailLevel.STANDARD, "standard"),
+    (DetailLevel.DETAILED, "detailed"),
+    (OutputFormat.MARKDOWN, "markdown"),
+    (OutputFormat.JSON, "json"),
+    (OutputFormat.TEXT, "text"),
+    (FileType.PYTHON, "python"),
+    (FileType.JAVASCRIPT, "javascript"),
+    (FileType.UNKNOWN, "unknown"),
+    (ProjectType.PYTHON, "python"),
+    (ProjectType.NODE, "node"),
+    (ProjectType.GENERIC, "generic"),
+], ids=str)
+def test_enum_value(member, expected):
+    """Test each enum member's string value."""
+    assert member.value == expected
 
 
-class TestProjectType(unittest.TestCase):
-    """Tests for ProjectType enum."""
-    
-    def test_python_value(self):
-        """Test Python project."""
-        self.assertEqual(ProjectType.PYTHON.value, "python")
-    
-    def test_node_value(self):
-        """Test Node project."""
-        self.assertEqual(ProjectType.NODE.value, "node")
-    
-    def test_generic_value(self):
-        """Test generic project."""
-        self.assertEqual(ProjectType.GENERIC.value, "generic")
-
-
-class TestCodeElement(unittest.TestCase):
+class TestCodeElement:
     """Tests for CodeElement dataclass."""
     
     def test_create_function(self):
@@ -113,10 +83,10 @@ class TestCodeElement(unittest.TestCase):
             docstring="Test function",
             parameters=["a", "b"]
         )
-        self.assertEqual(elem.name, "test_func")
-        self.assertEqual(elem.element_type, "function")
-        self.assertEqual(elem.line_number, 10)
-        self.assertEqual(elem.parameters, ["a", "b"])
+        assert elem.name == "test_func"
+        assert elem.element_type == "function"
+        assert elem.line_number == 10
+        assert elem.parameters == ["a", "b"]
     
     def test_create_class(self):
         """Test creating class element."""
@@ -125,11 +95,18 @@ class TestCodeElement(unittest.TestCase):
             element_type="class",
             line_number=1
         )
-        self.assertEqual(elem.name, "TestClass")
-        self.assertIsNone(elem.docstring)
+        assert elem.name == "TestClass"
+        assert elem.docstring is None
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_uses_slots(self):
+        """Test elements carry no per-instance __dict__ and still pickle."""
+        elem = CodeElement("func", "function", 1)
+        assert not hasattr(elem, "__dict__")
+        assert pickle.loads(pickle.dumps(elem)) == elem
 
 
-class TestFileSummary(unittest.TestCase):
+class TestFileSummary:
     """Tests for FileSummary dataclass."""
     
     def test_create_summary(self):
@@ -146,8 +123,8 @@ class TestFileSummary(unittest.TestCase):
             blockers=[],
             dependencies=[]
         )
-        self.assertEqual(summary.path, "/test/file.py")
-        self.assertEqual(summary.file_type, FileType.PYTHON)
+        assert summary.path == "/test/file.py"
+        assert summary.file_type == FileType.PYTHON
     
     def test_to_dict(self):
         """Test converting to dict."""
@@ -166,12 +143,19 @@ class TestFileSummary(unittest.TestCase):
             dependencies=[]
         )
         d = summary.to_dict()
-        self.assertEqual(d["path"], "/test/file.py")
-        self.assertEqual(d["file_type"], "python")
-        self.assertEqual(len(d["key_elements"]), 1)
+        assert d["path"] == "/test/file.py"
+        assert d["file_type"] == "python"
+        assert len(d["key_elements"]) == 1
+    
+    def test_name_derived_from_path(self):
+        """Test the base name is computed once at construction."""
+        summary = FileSummary("/src/pkg/mod.py", FileType.PYTHON, 1, 1, "", [], [], [], [], [])
+        assert summary.name == "mod.py"
+        assert "name" not in summary.to_dict()
+        assert pickle.loads(pickle.dumps(summary)).name == "mod.py"
 
 
-class TestFolderSummary(unittest.TestCase):
+class TestFolderSummary:
     """Tests for FolderSummary dataclass."""
     
     def test_create_summary(self):
@@ -184,8 +168,8 @@ class TestFolderSummary(unittest.TestCase):
             files=[],
             description="Test folder"
         )
-        self.assertEqual(summary.path, "/test/folder")
-        self.assertEqual(summary.file_count, 10)
+        assert summary.path == "/test/folder"
+        assert summary.file_count == 10
     
     def test_to_dict(self):
         """Test converting to dict."""
@@ -198,10 +182,16 @@ class TestFolderSummary(unittest.TestCase):
             description="Test"
         )
         d = summary.to_dict()
-        self.assertIn("file_types", d)
+        assert "file_types" in d
+    
+    def test_total_lines_str(self):
+        """Test the grouped line total is formatted once at construction."""
+        summary = FolderSummary("/src", 3, 1234567, {}, [], "")
+        assert summary.total_lines_str == "1,234,567"
+        assert "total_lines_str" not in summary.to_dict()
 
 
-class TestProjectSummary(unittest.TestCase):
+class TestProjectSummary:
     """Tests for ProjectSummary dataclass."""
     
     def test_create_summary(self):
@@ -223,8 +213,8 @@ class TestProjectSummary(unittest.TestCase):
             blockers=[],
             recent_changes=[]
         )
-        self.assertEqual(summary.name, "test-project")
-        self.assertEqual(summary.version, "1.0.0")
+        assert summary.name == "test-project"
+        assert summary.version == "1.0.0"
     
     def test_to_dict(self):
         """Test converting to dict."""
@@ -246,481 +236,894 @@ class TestProjectSummary(unittest.TestCase):
             recent_changes=[]
         )
         d = summary.to_dict()
-        self.assertEqual(d["project_type"], "node")
+        assert d["project_type"] == "node"
+
 
+@pytest.mark.parametrize("filename,expected", [
+    ("test.py", FileType.PYTHON),
+    ("app.js", FileType.JAVASCRIPT),
+    ("app.ts", FileType.TYPESCRIPT),
+    ("config.json", FileType.JSON_FILE),
+    ("README.md", FileType.MARKDOWN),
+    ("file.xyz", FileType.UNKNOWN),
+])
+def test_detect_file_type(filename, expected):
+    """Test file type detection by extension."""
+    assert FileAnalyzer.detect_file_type(Path(filename)) == expected
 
-class TestFileAnalyzer(unittest.TestCase):
+
+class TestFileAnalyzer:
     """Tests for FileAnalyzer class."""
     
-    def test_detect_python_file(self):
-        """Test detecting Python file."""
-        ftype = FileAnalyzer.detect_file_type(Path("test.py"))
-        self.assertEqual(ftype, FileType.PYTHON)
-    
-    def test_detect_javascript_file(self):
-        """Test detecting JavaScript file."""
-        ftype = FileAnalyzer.detect_file_type(Path("app.js"))
-        self.assertEqual(ftype, FileType.JAVASCRIPT)
-    
-    def test_detect_typescript_file(self):
-        """Test detecting TypeScript file."""
-        ftype = FileAnalyzer.detect_file_type(Path("app.ts"))
-        self.assertEqual(ftype, FileType.TYPESCRIPT)
-    
-    def test_detect_json_file(self):
-        """Test detecting JSON file."""
-        ftype = FileAnalyzer.detect_file_type(Path("config.json"))
-        self.assertEqual(ftype, FileType.JSON_FILE)
-    
-    def test_detect_markdown_file(self):
-        """Test detecting Markdown file."""
-        ftype = FileAnalyzer.detect_file_type(Path("README.md"))
-        self.assertEqual(ftype, FileType.MARKDOWN)
-    
-    def test_detect_unknown_file(self):
-        """Test detecting unknown file."""
-        ftype = FileAnalyzer.detect_file_type(Path("file.xyz"))
-        self.assertEqual(ftype, FileType.UNKNOWN)
-    
-    def test_analyze_python_file(self):
-        """Test analyzing Python file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = Path(tmpdir) / "test.py"
-            filepath.write_text('''
-def hello():
-    """Say hello."""
-    print("Hello")
-
-class MyClass:
-    """A class."""
-    pass
-
+    def test_analyze_python_nested_definitions(self):
+        """Test function bodies are only searched at the detailed level."""
+        source = b'''
 import os
-from pathlib import Path
 
-# TODO: Add more functions
-''')
-            
-            summary = FileAnalyzer.analyze_file(filepath)
-            
-            self.assertEqual(summary.file_type, FileType.PYTHON)
-            self.assertGreater(len(summary.key_elements), 0)
-            self.assertIn("os", summary.imports)
-            self.assertGreater(len(summary.todos), 0)
-    
-    def test_analyze_javascript_file(self):
-        """Test analyzing JavaScript file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = Path(tmpdir) / "test.js"
-            filepath.write_text('''
-function greet() {
-    console.log("Hello");
-}
-
-const add = (a, b) => a + b;
-
-class Calculator {
-    add(a, b) {
-        return a + b;
-    }
-}
-
-import React from 'react';
-const fs = require('fs');
-''')
-            
-            summary = FileAnalyzer.analyze_file(filepath)
-            
-            self.assertEqual(summary.file_type, FileType.JAVASCRIPT)
-            self.assertGreater(len(summary.key_elements), 0)
+class Service:
+    def start(self):
+        import json
+        def helper():
+            pass
+
+async def run():
+    pass
+'''
+        elements, imports, _ = FileAnalyzer._analyze_python(source)
+        assert [e.name for e in elements] == ["Service", "start", "run"]
+        assert imports == ["os"]
+        
+        elements, imports, _ = FileAnalyzer._analyze_python(source, DetailLevel.DETAILED)
+        assert [e.name for e in elements] == ["Service", "start", "helper", "run"]
+        assert imports == ["os", "json"]
+    
+    def test_imports_deduplicated_in_order(self):
+        """Test repeated imports are reported once, in source order."""
+        source = b"from typing import List\nimport os\nfrom typing import Dict\nimport sys\n"
+        assert FileAnalyzer._analyze_python(source)[1] == ["typing", "os", "sys"]
+        
+        broken = source + b"def broken(\n"
+        assert FileAnalyzer._analyze_python(broken)[1] == ["typing", "os", "sys"]
+    
+    def test_analyze_python_detail_levels(self):
+        """Test docstrings and parameters are only kept when detailed."""
+        source = b'import os\n\ndef greet(name):\n    \"\"\"Say hi.\"\"\"\n'
+        
+        elements, imports, _ = FileAnalyzer._analyze_python(source, DetailLevel.BRIEF)
+        assert elements == []
+        assert imports == ["os"]
+        
+        elements, _, _ = FileAnalyzer._analyze_python(source, DetailLevel.STANDARD)
+        assert elements[0].docstring is None
+        assert elements[0].parameters is None
+        
+        elements, _, _ = FileAnalyzer._analyze_python(source, DetailLevel.DETAILED)
+        assert elements[0].docstring == "Say hi."
+        assert elements[0].parameters == ["name"]
+    
+    @pytest.mark.parametrize("level", list(DetailLevel), ids=lambda level: level.value)
+    def test_description_counts_at_every_level(self, level, sample_js_file):
+        """Test brief descriptions still count classes and functions."""
+        summary = FileAnalyzer.analyze_file(sample_js_file, level)
+        assert summary.description == "test.js - 1 class(es) - 3 function(s) - 16 lines"
+        
+        parsed = b"class A:\n    def run(self):\n        pass\n\ndef main():\n    pass\n"
+        summary = FileAnalyzer.analyze_bytes(Path("app.py"), parsed, level)
+        assert summary.description == "app.py - 1 class(es) - 2 function(s) - 7 lines"
+        
+        # Syntax errors go through the regex fallback, which sees top-level defs only
+        broken = parsed + b"def broken(\n"
+        summary = FileAnalyzer.analyze_bytes(Path("app.py"), broken, level)
+        assert summary.description == "app.py - 1 class(es) - 2 function(s) - 8 lines"
     
     def test_extract_todos(self):
         """Test extracting TODOs."""
-        content = '''
-# TODO: Fix this bug
-// TODO: Add feature
-/* TODO: Refactor */
-'''
-        todos = FileAnalyzer._extract_todos(content)
-        self.assertGreater(len(todos), 0)
+        assert FileAnalyzer._extract_todos(TODO_BLOB) == ["Fix this bug", "Add feature", "Refactor"]
     
     def test_extract_blockers(self):
         """Test extracting blockers."""
-        content = '''
-# FIXME: This is broken
-// HACK: Temporary workaround
-/* BUG: Known issue */
-'''
-        blockers = FileAnalyzer._extract_blockers(content)
-        self.assertGreater(len(blockers), 0)
+        assert FileAnalyzer._extract_blockers(BLOCKER_BLOB) == [
+            "This is broken", "Temporary workaround", "Known issue"
+        ]
+    
+    def test_extract_comment_markers(self):
+        """Test TODOs and blockers are routed from one scan."""
+        content = b"# TODO: first\n// fixme: broken\n# todo later\n/* XXX odd */\n"
+        todos, blockers = FileAnalyzer._extract_comment_markers(content)
+        assert todos == ["first", "later"]
+        assert blockers == ["broken", "odd"]
+    
+    @pytest.mark.parametrize("engine", ["re", "re2"])
+    def test_comment_markers_non_utf8(self, engine):
+        """Test Latin-1 bytes don't hide markers from either regex engine."""
+        import contextsynth
+        re2 = pytest.importorskip("re2") if engine == "re2" else None
+        content = b"# TODO: caf\xe9 fix\n// FIXME: x\xff y\n# todo last"
+        
+        with patch('contextsynth.re2', re2):
+            pattern = contextsynth._compile_linear(contextsynth._COMMENT_MARKER_RE.pattern)
+        with patch('contextsynth._COMMENT_MARKER_RE', pattern):
+            todos, blockers = FileAnalyzer._extract_comment_markers(content)
+        
+        assert (todos, blockers) == (["caf fix", "last"], ["x y"])
+    
+    def test_foreign_re2_module_falls_back(self):
+        """Test an re2 module without google-re2's Options API is ignored."""
+        import importlib.util
+        import types
+        import contextsynth
+        stub = types.ModuleType("re2")
+        stub.compile = lambda *args: pytest.fail("stub re2 should not be used")
+        
+        # Import a fresh copy, as the pattern is compiled at import time
+        spec = importlib.util.spec_from_file_location("_contextsynth_stub_re2", contextsynth.__file__)
+        module = importlib.util.module_from_spec(spec)
+        with patch.dict(sys.modules, {"re2": stub}):
+            spec.loader.exec_module(module)
+        
+        assert module.re2 is stub
+        assert isinstance(module._COMMENT_MARKER_RE, type(re.compile(b"")))
+        assert module.FileAnalyzer._extract_comment_markers(b"# TODO: ok\n") == (["ok"], [])
+    
+    @pytest.mark.slow
+    def test_analyze_files_parallel_matches_serial(self, tmp_path):
+        """Test parallel analysis gives the same results as serial."""
+        files = []
+        for i in range(FileAnalyzer.PARALLEL_THRESHOLD + 2):
+            filepath = tmp_path / f"mod{i}.py"
+            filepath.write_text(f"def func{i}():\n    pass\n# TODO: item {i}\n")
+            files.append(filepath)
+        
+        serial = FileAnalyzer.analyze_files(files, max_workers=1)
+        parallel = FileAnalyzer.analyze_files(files, max_workers=2)
+        
+        assert serial == parallel
+        assert [s.path for s in parallel] == [str(f) for f in files]
+    
+    def test_single_worker_stays_serial(self):
+        """Test no process pool is started for one resolved worker."""
+        files = [Path(f"f{i}.py") for i in range(FileAnalyzer.PARALLEL_THRESHOLD + 2)]
+        with patch('concurrent.futures.ProcessPoolExecutor') as pool:
+            assert FileAnalyzer._map_files(str, files, 1) == [str(f) for f in files]
+            with patch('contextsynth.os.cpu_count', return_value=1):
+                FileAnalyzer._map_files(str, files, None)
+        pool.assert_not_called()
+        assert ContextSynth().max_workers == 1
+    
+    @pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"], ids=["lf", "crlf", "cr"])
+    def test_universal_newlines(self, tmp_path, newline):
+        """Test lone CRs and CRLFs each end one line, as read_text saw them."""
+        # def b(: forces the regex fallback, which anchors on line starts
+        py = newline.join(["import os", "def a():", "    pass", "# TODO: one",
+                           "# FIXME: two", "def b(:"]).encode()
+        js = newline.join(["import a from 'a';", "// TODO: t",
+                           "const g = () => 1;", "class C {}"]).encode()
+        filepath = tmp_path / "data.py"
+        filepath.write_bytes(py)
+        
+        assert FileAnalyzer.count_lines(filepath) == 6
+        summary = FileAnalyzer.analyze_bytes(filepath, py)
+        assert summary.line_count == 6
+        assert (summary.todos, summary.blockers, summary.imports) == (["one"], ["two"], ["os"])
+        assert [(e.name, e.line_number) for e in summary.key_elements] == [("a", 2), ("b", 6)]
+        
+        summary = FileAnalyzer.analyze_bytes(tmp_path / "data.js", js)
+        assert (summary.todos, summary.imports) == (["t"], ["a"])
+        assert [(e.name, e.line_number) for e in summary.key_elements] == [("g", 3), ("C", 4)]
+    
+    def test_mixed_newlines_line_count(self, tmp_path):
+        """Test LF, CRLF and lone CR mixed in one file, split across read chunks."""
+        filepath = tmp_path / "data.txt"
+        filepath.write_bytes(b"x\ry\nz\r\nw")
+        assert FileAnalyzer.count_lines(filepath) == 4
+        
+        with patch('contextsynth._CHUNK_SIZE', 6):
+            # The CRLF straddles the chunk boundary and still counts once
+            assert FileAnalyzer.count_lines(filepath) == 4
+    
+    def test_count_lines(self, tmp_path):
+        """Test counting lines without a full analysis."""
+        filepath = tmp_path / "data.txt"
+        filepath.write_bytes("one\ntw\u00f6\nthree".encode("utf-8"))
+        
+        assert FileAnalyzer.count_lines(filepath) == 3
+        assert FileAnalyzer.count_lines(tmp_path / "missing.txt") == 0
+    
+    @pytest.mark.slow
+    def test_large_file_memory_mapped(self, tmp_path):
+        """Test files above the mmap threshold give the same results."""
+        filepath = tmp_path / "big.py"
+        filler = b"x = 1\n" * (FileAnalyzer.MMAP_THRESHOLD // 6)
+        filepath.write_bytes(b"import os\n" + filler +
+                             b"def tail():\n    pass  # TODO: trim\n")
+        
+        summary = FileAnalyzer.analyze_file(filepath)
+        
+        assert summary.size_bytes > FileAnalyzer.MMAP_THRESHOLD
+        assert summary.line_count == filepath.read_bytes().count(b"\n") + 1
+        assert summary.imports == ["os"]
+        assert summary.todos == ["trim"]
+        tail = summary.key_elements[0]
+        assert (tail.name, tail.line_number) == ("tail", summary.line_count - 2)
+    
+    def test_analyze_bytes(self):
+        """Test analyzing content that is already in memory."""
+        summary = FileAnalyzer.analyze_bytes(Path("app.py"), b"import sys\nclass App:\n    pass\n")
+        
+        assert summary.file_type == FileType.PYTHON
+        assert summary.size_bytes == 31
+        assert summary.imports == ["sys"]
+        assert [e.name for e in summary.key_elements] == ["App"]
+
+
+def test_analyze_python_file(sample_py_summary):
+    """Test analyzing Python file."""
+    assert sample_py_summary.file_type == FileType.PYTHON
+    assert [e.name for e in sample_py_summary.key_elements] == ["hello", "MyClass"]
+    assert "os" in sample_py_summary.imports
+    assert sample_py_summary.todos
+
+
+def test_analyze_javascript_file(sample_js_file):
+    """Test analyzing JavaScript file."""
+    summary = FileAnalyzer.analyze_file(sample_js_file)
+    
+    assert summary.file_type == FileType.JAVASCRIPT
+    assert summary.key_elements
+    lines = {e.name: e.line_number for e in summary.key_elements}
+    assert lines["greet"] == 2
+    assert lines["add"] == 6
+    assert lines["Calculator"] == 8
 
 
-class TestProjectAnalyzer(unittest.TestCase):
+class TestAnalysisCache:
+    """Tests for AnalysisCache class."""
+    
+    def test_cache_hit_skips_analysis(self, tmp_path):
+        """Test unchanged files are served from the cache."""
+        filepath = tmp_path / "test.py"
+        filepath.write_text("def hello():\n    pass\n# TODO: cache me\n")
+        cache = AnalysisCache(tmp_path / "cache.db")
+        
+        first = ContextSynth(cache=cache).summarize_file(filepath)
+        with patch.object(FileAnalyzer, '_analyze_python') as analyze:
+            second = ContextSynth(cache=cache).summarize_file(filepath)
+            analyze.assert_not_called()
+        cache.close()
+        
+        assert first == second
+    
+    def test_default_path_resolved_lazily(self, tmp_path):
+        """Test the home directory is only looked up when no path is given."""
+        with patch('contextsynth.Path.home', side_effect=RuntimeError("no home")):
+            assert AnalysisCache(tmp_path / "cache.db").db_path == tmp_path / "cache.db"
+        with patch('contextsynth.Path.home', return_value=tmp_path):
+            assert AnalysisCache().db_path == tmp_path / ".contextsynth_cache.db"
+    
+    def test_cache_miss_on_change(self, tmp_path):
+        """Test edited files are analyzed again."""
+        filepath = tmp_path / "test.py"
+        cache = AnalysisCache(tmp_path / "cache.db")
+        
+        filepath.write_text("def one():\n    pass\n")
+        FileAnalyzer.analyze_files([filepath], cache=cache)
+        filepath.write_text("def two():\n    pass\n")
+        summary = FileAnalyzer.analyze_files([filepath], cache=cache)[0]
+        cache.close()
+        
+        assert summary.key_elements[0].name == "two"
+    
+    @pytest.mark.slow
+    def test_parallel_results_are_stored(self, tmp_path):
+        """Test entries produced in worker processes reach the database."""
+        files = []
+        for i in range(FileAnalyzer.PARALLEL_THRESHOLD):
+            filepath = tmp_path / f"mod{i}.py"
+            filepath.write_text(f"x = {i}")
+            files.append(filepath)
+        cache = AnalysisCache(tmp_path / "cache.db")
+        
+        FileAnalyzer.analyze_files(files, max_workers=2, cache=cache)
+        count = cache._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        cache.close()
+        
+        assert count == len(files)
+
+
+class TestProjectAnalyzer:
     """Tests for ProjectAnalyzer class."""
     
-    def test_detect_node_project(self):
-        """Test detecting Node.js project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            pkg_json = Path(tmpdir) / "package.json"
-            pkg_json.write_text('{"name": "test"}')
-            
-            ptype = ProjectAnalyzer.detect_project_type(Path(tmpdir))
-            self.assertEqual(ptype, ProjectType.NODE)
-    
-    def test_detect_python_project(self):
-        """Test detecting Python project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            req_txt = Path(tmpdir) / "requirements.txt"
-            req_txt.write_text("flask==2.0.0")
-            
-            ptype = ProjectAnalyzer.detect_project_type(Path(tmpdir))
-            self.assertEqual(ptype, ProjectType.PYTHON)
-    
-    def test_detect_rust_project(self):
-        """Test detecting Rust project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cargo = Path(tmpdir) / "Cargo.toml"
-            cargo.write_text('[package]\nname = "test"')
-            
-            ptype = ProjectAnalyzer.detect_project_type(Path(tmpdir))
-            self.assertEqual(ptype, ProjectType.RUST)
-    
-    def test_detect_generic_project(self):
-        """Test detecting generic project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            ptype = ProjectAnalyzer.detect_project_type(Path(tmpdir))
-            self.assertEqual(ptype, ProjectType.GENERIC)
-    
-    def test_analyze_node_project(self):
-        """Test analyzing Node.js project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create package.json
-            pkg_json = Path(tmpdir) / "package.json"
-            pkg_json.write_text(json.dumps({
-                "name": "test-project",
-                "version": "1.0.0",
-                "description": "A test project",
-                "dependencies": {"express": "^4.18.0"},
-                "devDependencies": {"jest": "^29.0.0"}
-            }))
-            
-            # Create index.js
-            index_js = Path(tmpdir) / "index.js"
-            index_js.write_text('console.log("Hello");')
-            
-            summary = ProjectAnalyzer.analyze_project(Path(tmpdir))
-            
-            self.assertEqual(summary.project_type, ProjectType.NODE)
-            self.assertEqual(summary.name, "test-project")
-            self.assertEqual(summary.version, "1.0.0")
-            self.assertIn("express", summary.dependencies)
-    
-    def test_analyze_python_project(self):
-        """Test analyzing Python project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create requirements.txt
-            req_txt = Path(tmpdir) / "requirements.txt"
-            req_txt.write_text("flask>=2.0.0\nrequests")
-            
-            # Create main.py
-            main_py = Path(tmpdir) / "main.py"
-            main_py.write_text('print("Hello")')
-            
-            summary = ProjectAnalyzer.analyze_project(Path(tmpdir))
-            
-            self.assertEqual(summary.project_type, ProjectType.PYTHON)
-            self.assertIn("flask", summary.dependencies)
-
-
-class TestContextSynth(unittest.TestCase):
-    """Tests for ContextSynth class."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.synth = ContextSynth()
-        self.tmpdir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
-    
-    def test_init_default(self):
-        """Test default initialization."""
-        synth = ContextSynth()
-        self.assertEqual(synth.detail_level, DetailLevel.STANDARD)
-    
-    def test_init_brief(self):
-        """Test brief initialization."""
-        synth = ContextSynth(DetailLevel.BRIEF)
-        self.assertEqual(synth.detail_level, DetailLevel.BRIEF)
-    
-    def test_summarize_file(self):
-        """Test file summarization."""
-        filepath = Path(self.tmpdir) / "test.py"
-        filepath.write_text("def hello():\n    pass")
-        
-        summary = self.synth.summarize_file(filepath)
-        
-        self.assertIsInstance(summary, FileSummary)
-        self.assertEqual(summary.file_type, FileType.PYTHON)
-    
-    def test_summarize_folder(self):
-        """Test folder summarization."""
-        # Create test files
-        (Path(self.tmpdir) / "test1.py").write_text("print(1)")
-        (Path(self.tmpdir) / "test2.py").write_text("print(2)")
-        
-        summary = self.synth.summarize_folder(Path(self.tmpdir))
-        
-        self.assertIsInstance(summary, FolderSummary)
-        self.assertEqual(summary.file_count, 2)
-    
-    def test_summarize_project(self):
-        """Test project summarization."""
-        # Create package.json
-        (Path(self.tmpdir) / "package.json").write_text('{"name": "test"}')
-        
-        summary = self.synth.summarize_project(Path(self.tmpdir))
-        
-        self.assertIsInstance(summary, ProjectSummary)
-        self.assertEqual(summary.project_type, ProjectType.NODE)
-    
-    def test_format_markdown_file(self):
-        """Test markdown formatting for file."""
-        filepath = Path(self.tmpdir) / "test.py"
-        filepath.write_text("def hello():\n    pass")
-        
-        summary = self.synth.summarize_file(filepath)
-        markdown = self.synth.format_markdown(summary)
-        
-        self.assertIn("# File Summary", markdown)
-        self.assertIn("test.py", markdown)
-    
-    def test_format_json_file(self):
-        """Test JSON formatting for file."""
-        filepath = Path(self.tmpdir) / "test.py"
-        filepath.write_text("def hello():\n    pass")
-        
-        summary = self.synth.summarize_file(filepath)
-        json_str = self.synth.format_json(summary)
-        
-        data = json.loads(json_str)
-        self.assertIn("path", data)
-        self.assertIn("file_type", data)
+    def test_analyze_project_line_totals(self, tmp_path):
+        """Test total lines and key files come from the same analysis pass."""
+        (tmp_path / "main.py").write_text("a = 1\nb = 2\n")
+        for i in range(FileAnalyzer.PARALLEL_THRESHOLD):
+            (tmp_path / f"mod{i}.py").write_text("x = 1")
+        
+        # Non-key files only need a line count, which never starts a pool
+        with patch('concurrent.futures.ProcessPoolExecutor') as pool:
+            summary = ProjectAnalyzer.analyze_project(tmp_path, max_workers=2)
+        
+        pool.assert_not_called()
+        assert summary.file_count == FileAnalyzer.PARALLEL_THRESHOLD + 1
+        assert summary.total_lines == 3 + FileAnalyzer.PARALLEL_THRESHOLD
+        assert [Path(f.path).name for f in summary.key_files] == ["main.py"]
+    
+    def test_analyze_project_async_matches_sync(self, tmp_path):
+        """Test the concurrent-read path builds the same summary."""
+        (tmp_path / "requirements.txt").write_text("flask>=2.0\n")
+        (tmp_path / "main.py").write_text("import os\n\ndef main():\n    pass  # TODO: run\n")
+        (tmp_path / "util.py").write_text("x = 1\n")
+        
+        expected = ProjectAnalyzer.analyze_project(tmp_path)
+        summary = asyncio.run(ProjectAnalyzer.analyze_project_async(tmp_path))
+        
+        assert summary.to_dict() == expected.to_dict()
+        assert summary.todos == ["run"]
+    
+    def test_recent_changes_without_git(self, tmp_path):
+        """Test git is not run outside a repository."""
+        with patch.object(ProjectAnalyzer, '_in_git_repo', return_value=False), \
+                patch('subprocess.run') as run:
+            assert ProjectAnalyzer._get_recent_changes(tmp_path) == []
+            run.assert_not_called()
     
-    def test_format_text_file(self):
-        """Test text formatting for file."""
-        filepath = Path(self.tmpdir) / "test.py"
-        filepath.write_text("def hello():\n    pass")
+    def test_in_git_repo_checks_parents(self, tmp_path):
+        """Test subdirectories of a repository are recognized."""
+        (tmp_path / ".git").mkdir()
+        sub = tmp_path / "pkg" / "sub"
+        sub.mkdir(parents=True)
+        assert ProjectAnalyzer._in_git_repo(sub)
+    
+    def test_load_project_manifest(self, tmp_path):
+        """Test manifests are loaded once and bad JSON is left out."""
+        (tmp_path / "package.json").write_text("{not json")
+        (tmp_path / "requirements.txt").write_text("flask\n")
+        
+        manifest = ProjectAnalyzer._load_project_manifest(tmp_path)
+        
+        assert manifest == {"requirements.txt": "flask\n"}
+    
+    def test_pyproject_metadata(self, tmp_path):
+        """Test metadata is read from the [project] table."""
+        (tmp_path / "pyproject.toml").write_text(
+            '[build-system]\nrequires = ["setuptools"]\n\n'
+            '[project]\nname = "demo"\nversion = "0.3.0"\n'
+            'description = "A demo package"\n'
+        )
         
-        summary = self.synth.summarize_file(filepath)
-        text = self.synth.format_text(summary)
+        summary = ProjectAnalyzer.analyze_project(tmp_path)
         
-        self.assertIn("File:", text)
-        self.assertIn("Type:", text)
+        assert summary.name == "demo"
+        assert summary.version == "0.3.0"
+        assert summary.description == "A demo package"
     
-    def test_format_markdown_project(self):
-        """Test markdown formatting for project."""
-        (Path(self.tmpdir) / "package.json").write_text('{"name": "test", "version": "1.0.0"}')
+    def test_cargo_metadata(self, tmp_path):
+        """Test metadata is read from Cargo.toml."""
+        (tmp_path / "Cargo.toml").write_text(
+            '[package]\nname = "crab"\nversion = "1.2.3"\n'
+        )
         
-        summary = self.synth.summarize_project(Path(self.tmpdir))
-        markdown = self.synth.format_markdown(summary)
+        summary = ProjectAnalyzer.analyze_project(tmp_path)
         
-        self.assertIn("# Project Summary", markdown)
+        assert summary.name == "crab"
+        assert summary.version == "1.2.3"
     
-    def test_format_json_project(self):
-        """Test JSON formatting for project."""
-        (Path(self.tmpdir) / "package.json").write_text('{"name": "test"}')
+    def test_readme_description_first_lines_only(self, tmp_path):
+        """Test the README fallback only searches the first 10 lines."""
+        readme = tmp_path / "README.md"
+        readme.write_text("# Title\n" + "#\n" * 9 + "Too far down.\n")
+        assert ProjectAnalyzer._extract_metadata(tmp_path, ProjectType.GENERIC, {})[1] == ""
         
-        summary = self.synth.summarize_project(Path(self.tmpdir))
-        json_str = self.synth.format_json(summary)
+        readme.write_text("# Title\n" + "#\n" * 8 + "Just in time.\n")
+        assert (ProjectAnalyzer._extract_metadata(tmp_path, ProjectType.GENERIC, {})[1]
+                == "Just in time.")
+    
+    def test_collect_files(self, tmp_path):
+        """Test file collection skips excluded directories and unknown files."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "main.py").write_text("x = 1")
+        (tmp_path / "src" / "App.TSX").write_text("x")
+        (tmp_path / "node_modules" / "lib.js").write_text("x")
+        (tmp_path / "notes.xyz").write_text("x")
+        (tmp_path / ".py").write_text("x")
+        
+        files = sorted(ProjectAnalyzer._collect_files(tmp_path))
+        
+        assert files == sorted([
+            os.path.join(tmp_path, "main.py"),
+            os.path.join(tmp_path, "src", "App.TSX"),
+        ])
+
+
+@pytest.mark.parametrize("marker,content,expected", [
+    ("package.json", '{"name": "test"}', ProjectType.NODE),
+    ("requirements.txt", "flask==2.0.0", ProjectType.PYTHON),
+    ("Cargo.toml", '[package]\nname = "test"', ProjectType.RUST),
+    (None, None, ProjectType.GENERIC),
+])
+def test_detect_project_type(tmp_path, marker, content, expected):
+    """Test project type detection from its marker file."""
+    if marker:
+        (tmp_path / marker).write_text(content)
+    assert ProjectAnalyzer.detect_project_type(tmp_path) == expected
+
+
+def test_analyze_node_project(node_summary):
+    """Test analyzing Node.js project."""
+    assert node_summary.project_type == ProjectType.NODE
+    assert node_summary.name == "my-app"
+    assert node_summary.version == "2.0.0"
+    assert "express" in node_summary.dependencies
+
+
+def test_analyze_python_project(python_summary):
+    """Test analyzing Python project."""
+    assert python_summary.project_type == ProjectType.PYTHON
+    assert "flask" in python_summary.dependencies
+
+
+def test_init_default():
+    """Test default initialization."""
+    synth = ContextSynth()
+    assert synth.detail_level == DetailLevel.STANDARD
+
+
+@pytest.mark.parametrize("level", list(DetailLevel), ids=lambda level: level.value)
+def test_init_detail_level(level):
+    """Test each detail level is stored on the instance."""
+    assert ContextSynth(level).detail_level == level
+
+
+def test_summarize_file(sample_py_file, detail_synth):
+    """Test file summarization at each detail level."""
+    summary = detail_synth.summarize_file(sample_py_file)
+    
+    assert isinstance(summary, FileSummary)
+    assert summary.file_type == FileType.PYTHON
+    # Brief summaries list imports and TODOs but no code elements
+    brief = detail_synth.detail_level == DetailLevel.BRIEF
+    assert [e.name for e in summary.key_elements] == ([] if brief else ["hello", "MyClass"])
+
+
+def test_summarize_folder(tmp_path, detail_synth):
+    """Test folder summarization aggregates per-file summaries."""
+    (tmp_path / "test1.py").touch()
+    (tmp_path / "test2.py").touch()
+    (tmp_path / "notes.xyz").touch()
+    stub = FileSummary("x.py", FileType.PYTHON, 0, 3, "", [], [], [], [], [])
+    
+    with patch("contextsynth.FileAnalyzer.analyze_file", return_value=stub) as analyze:
+        summary = detail_synth.summarize_folder(tmp_path)
+    
+    assert sorted(call.args[0].name for call in analyze.call_args_list) == ["test1.py", "test2.py"]
+    assert all(call.kwargs["detail_level"] == detail_synth.detail_level
+               for call in analyze.call_args_list)
+    assert isinstance(summary, FolderSummary)
+    assert summary.file_count == 2
+    assert summary.total_lines == 6
+    assert summary.file_types == {"python": 2}
+
+
+def test_summarize_project(detail_synth):
+    """Test project summarization delegates to ProjectAnalyzer."""
+    with patch("contextsynth.ProjectAnalyzer.analyze_project") as analyze:
+        summary = detail_synth.summarize_project(Path("proj"))
+    
+    analyze.assert_called_once_with(Path("proj"), detail_synth.detail_level, 1, None)
+    assert summary is analyze.return_value
+
+
+@pytest.mark.parametrize("method,needles", [
+    ("format_markdown", ["# File Summary", "test.py"]),
+    ("format_json", ['"path"', '"file_type"']),
+    ("format_text", ["File:", "Type:"]),
+], ids=["markdown", "json", "text"])
+def test_format_file(sample_py_summary, method, needles, synth):
+    """Test each formatter renders a file summary."""
+    output = getattr(synth, method)(sample_py_summary)
+    for needle in needles:
+        assert needle in output
+
+
+def test_format_markdown_file_layout(synth):
+    """Test the exact markdown layout for a file summary."""
+    summary = FileSummary(
+        path="/src/app.py",
+        file_type=FileType.PYTHON,
+        size_bytes=1234,
+        line_count=40,
+        description="app.py",
+        key_elements=[CodeElement("run", "function", 3, docstring="Run it.")],
+        imports=["os", "sys"],
+        todos=["Add tests"],
+        blockers=["Crashes on empty input"],
+        dependencies=[]
+    )
+    
+    assert synth.format_markdown(summary) == (
+        "# File Summary: app.py\n\n"
+        "**Path:** `/src/app.py`\n"
+        "**Type:** python\n"
+        "**Size:** 1,234 bytes\n"
+        "**Lines:** 40\n\n"
+        "## Key Elements\n\n"
+        "- **function** `run` (line 3)\n"
+        "  - Run it.\n\n"
+        "## Imports\n\n"
+        "`os`, `sys`\n\n"
+        "## TODOs\n\n"
+        "- [ ] Add tests\n\n"
+        "## Blockers\n\n"
+        "- [!] Crashes on empty input\n"
+    )
+
+
+def test_format_markdown_folder_type_order(synth):
+    """Test file types are listed by count, ties in original order."""
+    summary = FolderSummary(
+        path="/src",
+        file_count=9,
+        total_lines=90,
+        file_types={"json": 2, "python": 5, "css": 2},
+        files=[],
+        description=""
+    )
+    
+    markdown = synth.format_markdown(summary)
+    
+    assert "## File Types\n\n- python: 5\n- json: 2\n- css: 2\n" in markdown
+
+
+def test_format_markdown_project_layout(synth):
+    """Test the exact markdown layout for a project summary."""
+    key_file = FileSummary("/proj/main.py", FileType.PYTHON, 10, 2, "main.py - 2 lines",
+                           [], [], [], [], [])
+    summary = ProjectSummary(
+        path="/proj",
+        project_type=ProjectType.PYTHON,
+        name="proj",
+        description="A sample project",
+        version="0.1.0",
+        file_count=3,
+        total_lines=12345,
+        main_technologies=["Python"],
+        dependencies=["flask", "requests"],
+        dev_dependencies=[],
+        entry_points=["main.py", "src/app.py"],
+        key_files=[key_file, key_file],
+        todos=["Write docs"],
+        blockers=["Broken build"],
+        recent_changes=["abc123 Initial commit"]
+    )
+    
+    assert synth.format_markdown(summary) == (
+        "# Project Summary: proj\n\n"
+        "**Type:** python\n"
+        "**Version:** 0.1.0\n"
+        "**Files:** 3\n"
+        "**Total Lines:** 12,345\n\n"
+        "> A sample project\n\n"
+        "## Technologies\n\n"
+        "**Python**\n\n"
+        "## Entry Points\n\n"
+        "- `main.py`\n"
+        "- `src/app.py`\n\n"
+        "## Dependencies\n\n"
+        "`flask`, `requests`\n\n"
+        "## Key Files\n\n"
+        "### main.py\n"
+        "main.py - 2 lines\n\n"
+        "### main.py\n"
+        "main.py - 2 lines\n\n"
+        "## TODOs\n\n"
+        "- [ ] Write docs\n\n"
+        "## Blockers\n\n"
+        "- [!] Broken build\n\n"
+        "## Recent Changes\n\n"
+        "- abc123 Initial commit\n"
+    )
+
+
+def test_format_reuses_output_for_unchanged_files(tmp_path):
+    """Test format() memoizes file output until the file's mtime changes."""
+    synth = ContextSynth()
+    filepath = tmp_path / "test.py"
+    filepath.write_text("def hello():\n    pass\n")
+    summary = synth.summarize_file(filepath)
+    assert summary.mtime_ns == filepath.stat().st_mtime_ns
+    
+    with patch.object(ContextSynth, '_write_file_markdown',
+                      wraps=synth._write_file_markdown) as fmt:
+        first = synth.format(summary, OutputFormat.MARKDOWN)
+        second = synth.format(summary, OutputFormat.MARKDOWN)
+        assert fmt.call_count == 1
+        assert first == second
+        assert first == synth.format_markdown(summary)
         
-        data = json.loads(json_str)
-        self.assertIn("project_type", data)
+        # A newer modification time is a different entry
+        os.utime(filepath, ns=(summary.mtime_ns, summary.mtime_ns + 10**9))
+        synth.format(synth.summarize_file(filepath), OutputFormat.MARKDOWN)
+        assert fmt.call_count == 3
+    
+    assert synth.format(summary, OutputFormat.TEXT) == synth.format_text(summary)
+
+
+def test_format_follows_content_at_same_mtime(tmp_path):
+    """Test format() re-renders a file rewritten without moving its mtime."""
+    synth = ContextSynth()
+    filepath = tmp_path / "test.py"
+    filepath.write_text("def a(): pass\n")
+    before = synth.summarize_file(filepath)
+    assert "TODOs: 0" in synth.format(before, OutputFormat.TEXT)
+    
+    # Same size and mtime, different content
+    filepath.write_text("# TODO: fix\nx\n")
+    os.utime(filepath, ns=(before.mtime_ns, before.mtime_ns))
+    after = synth.summarize_file(filepath)
+    assert (after.mtime_ns, after.size_bytes) == (before.mtime_ns, before.size_bytes)
+    
+    assert synth.format(after, OutputFormat.TEXT) == synth.format_text(after)
+    assert "TODOs: 1" in synth.format(after, OutputFormat.TEXT)
 
 
-class TestCLI(unittest.TestCase):
+def test_format_text_project_layout(synth):
+    """Test the exact text layout for a project summary."""
+    summary = ProjectSummary(
+        path="/proj", project_type=ProjectType.NODE, name="web", description="",
+        version=None, file_count=12, total_lines=4321,
+        main_technologies=["Node.js", "React"], dependencies=["react", "vite"],
+        dev_dependencies=[], entry_points=[], key_files=[], todos=["a"],
+        blockers=[], recent_changes=[]
+    )
+    
+    assert synth.format_text(summary) == (
+        "Project: web\n"
+        "Type: node\n"
+        "Version: unknown\n"
+        "Files: 12\n"
+        "Lines: 4,321\n"
+        "Technologies: Node.js, React\n"
+        "Dependencies: 2\n"
+        "TODOs: 1"
+    )
+
+
+def test_format_markdown_project(node_summary, synth):
+    """Test markdown formatting for project."""
+    markdown = synth.format_markdown(node_summary)
+    
+    assert "# Project Summary" in markdown
+
+
+def test_format_json_project(node_summary, synth):
+    """Test JSON formatting for project."""
+    data = json.loads(synth.format_json(node_summary))
+    assert "project_type" in data
+
+
+def test_format_json_matches_stdlib(tmp_path, synth):
+    """Test JSON output is identical with and without orjson."""
+    filepath = tmp_path / "t\u00e9st.py"
+    filepath.write_text("def hello():\n    pass  # TODO: caf\u00e9")
+    summary = synth.summarize_file(filepath)
+    
+    with patch('contextsynth.orjson', None):
+        expected = synth.format_json(summary)
+    
+    assert synth.format_json(summary) == expected
+    assert json.loads(expected)["todos"] == ["caf\u00e9"]
+
+
+def test_file_command(tmp_path, capsys, monkeypatch):
+    """Test file command."""
+    filepath = tmp_path / "test.py"
+    filepath.write_text("print('hello')")
+    
+    monkeypatch.setattr(sys, "argv", ['contextsynth', 'file', str(filepath)])
+    main()
+    
+    assert "File Summary" in capsys.readouterr().out
+
+
+def test_project_command(node_project, capsys, monkeypatch):
+    """Test project command."""
+    monkeypatch.setattr(sys, "argv", ['contextsynth', 'project', str(node_project)])
+    main()
+    
+    assert "Project Summary" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("command,label", [
+    ("file", "File"),
+    ("folder", "Folder"),
+    ("project", "Project"),
+])
+def test_missing_path_exit_code(command, label, capsys, monkeypatch):
+    """Test a missing path reports an error and exits with status 1."""
+    monkeypatch.setattr(sys, "argv", ['contextsynth', command, '/nonexistent/path'])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    
+    assert exc.value.code == 1
+    assert f"Error: {label} not found" in capsys.readouterr().out
+
+
+def test_empty_file_is_not_missing(tmp_path, capsys, monkeypatch):
+    """Test an existing empty file is summarized, not reported missing."""
+    filepath = tmp_path / "empty.py"
+    filepath.write_text("")
+    
+    monkeypatch.setattr(sys, "argv", ['contextsynth', 'file', str(filepath)])
+    main()
+    
+    assert "# File Summary: empty.py" in capsys.readouterr().out
+
+
+def test_no_command_prints_help(capsys, monkeypatch):
+    """Test running without a command prints help and returns normally."""
+    monkeypatch.setattr(sys, "argv", ['contextsynth'])
+    
+    assert main() is None
+    assert "usage:" in capsys.readouterr().out
+
+
+class TestCLI:
     """Tests for CLI interface."""
     
-    def test_file_command(self):
-        """Test file command."""
-        import sys
-        from io import StringIO
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = Path(tmpdir) / "test.py"
-            filepath.write_text("print('hello')")
-            
-            captured = StringIO()
-            sys.stdout = captured
-            
-            try:
-                from contextsynth import main
-                with patch('sys.argv', ['contextsynth', 'file', str(filepath)]):
-                    main()
-            except SystemExit:
-                pass
-            finally:
-                sys.stdout = sys.__stdout__
-            
-            output = captured.getvalue()
-            self.assertIn("File Summary", output)
-    
-    def test_project_command(self):
-        """Test project command."""
-        import sys
-        from io import StringIO
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            (Path(tmpdir) / "package.json").write_text('{"name": "test"}')
-            
-            captured = StringIO()
-            sys.stdout = captured
-            
-            try:
-                from contextsynth import main
-                with patch('sys.argv', ['contextsynth', 'project', tmpdir]):
-                    main()
-            except SystemExit:
-                pass
-            finally:
-                sys.stdout = sys.__stdout__
-            
-            output = captured.getvalue()
-            self.assertIn("Project Summary", output)
-
-
-class TestEdgeCases(unittest.TestCase):
+    def test_parser_built_once(self):
+        """Test repeated CLI calls reuse one parser."""
+        parser = _build_parser()
+        assert _build_parser() is parser
+        
+        args = parser.parse_args(['project', '.', '--format', 'json'])
+        assert (args.command, args.format) == ("project", "json")
+        args = parser.parse_args(['file', 'x.py'])
+        assert (args.command, args.format) == ("file", "markdown")
+    
+    @pytest.mark.parametrize("argv", [['file', 'x.py'], ['folder', 'src'], ['project']])
+    def test_every_command_has_detail(self, argv):
+        """Test --detail is accepted and defaulted by every subcommand."""
+        parser = _build_parser()
+        assert parser.parse_args(argv).detail == "standard"
+        args = parser.parse_args(argv + ['--detail', 'brief'])
+        assert args.detail == "brief"
+    
+    def test_output_file(self, tmp_path, capsys, monkeypatch):
+        """Test --output writes the formatted summary to a file."""
+        filepath = tmp_path / "test.py"
+        filepath.write_text("def hello():\n    pass\n")
+        outpath = tmp_path / "summary.json"
+        
+        monkeypatch.setattr(sys, "argv", ['contextsynth', 'file', str(filepath),
+                                          '--format', 'json', '--output', str(outpath)])
+        main()
+        
+        assert capsys.readouterr().out == f"Summary saved to {outpath}\n"
+        data = json.loads(outpath.read_text(encoding='utf-8'))
+        assert data["path"] == str(filepath)
+        assert data["key_elements"][0]["name"] == "hello"
+    
+    @pytest.mark.parametrize("stdlib_only", [False, True])
+    def test_output_file_json_streamed(self, synth, stdlib_only, tmp_path, capsys, monkeypatch):
+        """Test JSON written to a file matches format_json, with or without orjson."""
+        filepath = tmp_path / "test.py"
+        filepath.write_text("def caf\u00e9():\n    pass\n", encoding="utf-8")
+        outpath = tmp_path / "summary.json"
+        expected = synth.format_json(synth.summarize_file(filepath))
+        
+        monkeypatch.setattr(sys, "argv", ['contextsynth', 'file', str(filepath),
+                                          '-f', 'json', '-o', str(outpath)])
+        if stdlib_only:
+            monkeypatch.setattr("contextsynth.orjson", None)
+        main()
+        
+        assert capsys.readouterr().out == f"Summary saved to {outpath}\n"
+        assert outpath.read_text(encoding='utf-8') == expected
+    
+    def test_output_file_markdown_streamed(self, synth, tmp_path, capsys, monkeypatch):
+        """Test streamed markdown output matches format_markdown exactly."""
+        filepath = tmp_path / "test.py"
+        filepath.write_text("import os\n\ndef hello():\n    pass  # TODO: greet \u00e9\n", encoding="utf-8")
+        outpath = tmp_path / "summary.md"
+        
+        monkeypatch.setattr(sys, "argv", ['contextsynth', 'file', str(filepath),
+                                          '--output', str(outpath)])
+        main()
+        
+        assert capsys.readouterr().out == f"Summary saved to {outpath}\n"
+        expected = synth.format_markdown(synth.summarize_file(filepath))
+        assert outpath.read_bytes() == expected.encode('utf-8')
+    
+    @pytest.mark.skipif(not hasattr(os, "writev"), reason="os.writev is POSIX-only")
+    def test_gathered_writer_short_writes(self, tmp_path):
+        """Test the gathered writer resumes after partial writev calls."""
+        real_writev = os.writev
+        
+        def short_writev(fd, buffers):
+            # Write at most 5 bytes per call, splitting chunks mid-way
+            data = b"".join(buffers)[:5]
+            return real_writev(fd, [data])
+        
+        chunks = [f"chunk {i}\n" for i in range(150)] + ["", "end"]
+        outpath = tmp_path / "out.txt"
+        with patch('contextsynth.os.writev', side_effect=short_writev):
+            with _GatheredFileWriter(str(outpath)) as out:
+                for chunk in chunks:
+                    out.write(chunk)
+        
+        assert outpath.read_text() == "".join(chunks)
+
+
+class TestEdgeCases:
     """Tests for edge cases."""
     
     def test_empty_file(self):
         """Test analyzing empty file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = Path(tmpdir) / "empty.py"
-            filepath.write_text("")
-            
-            summary = FileAnalyzer.analyze_file(filepath)
-            self.assertEqual(summary.line_count, 1)  # Even empty file has 1 line
-    
-    def test_binary_file(self):
+        summary = FileAnalyzer.analyze_bytes(Path("empty.py"), b"")
+        assert summary.line_count == 1  # Even empty file has 1 line
+    
+    def test_binary_file(self, tmp_path):
         """Test handling binary file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = Path(tmpdir) / "test.bin"
-            filepath.write_bytes(b'\x00\x01\x02\x03')
-            
-            summary = FileAnalyzer.analyze_file(filepath)
-            self.assertEqual(summary.file_type, FileType.UNKNOWN)
-    
-    def test_nonexistent_file(self):
+        filepath = tmp_path / "test.bin"
+        filepath.write_bytes(b'\x00\x01\x02\x03')
+        
+        summary = FileAnalyzer.analyze_file(filepath)
+        assert summary.file_type == FileType.UNKNOWN
+        assert summary.size_bytes == 4
+        assert summary.line_count == 0  # Unknown types are not read
+        assert summary.description == "test.bin"
+    
+    def test_nonexistent_file(self, synth, tmp_path):
         """Test with non-existent file."""
-        synth = ContextSynth()
         # Should not crash - returns summary with empty content
-        summary = synth.summarize_file(Path("C:/nonexistent/path.py"))
-        self.assertEqual(summary.line_count, 1)
-        self.assertEqual(summary.size_bytes, 0)
+        summary = synth.summarize_file(tmp_path / "definitely_missing.py")
+        assert summary.line_count == 1
+        assert summary.size_bytes == 0
     
     def test_malformed_python(self):
         """Test analyzing malformed Python."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = Path(tmpdir) / "broken.py"
-            filepath.write_text("def broken(\n  syntax error here")
-            
-            # Should fall back to regex analysis
-            summary = FileAnalyzer.analyze_file(filepath)
-            self.assertIsInstance(summary, FileSummary)
-    
-    def test_deeply_nested_project(self):
+        source = b"import os\n\ndef broken(\n  syntax error here"
+        
+        # Should fall back to regex analysis
+        summary = FileAnalyzer.analyze_bytes(Path("broken.py"), source)
+        assert isinstance(summary, FileSummary)
+        assert summary.key_elements[0].name == "broken"
+        assert summary.key_elements[0].line_number == 3
+    
+    @pytest.mark.slow
+    def test_deeply_nested_project(self, synth, deep_project):
         """Test project with deep nesting."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create deep structure
-            deep = Path(tmpdir) / "a" / "b" / "c" / "d"
-            deep.mkdir(parents=True)
-            (deep / "deep.py").write_text("print('deep')")
-            (Path(tmpdir) / "package.json").write_text('{"name": "test"}')
-            
-            synth = ContextSynth()
-            summary = synth.summarize_project(Path(tmpdir))
-            
-            self.assertIsInstance(summary, ProjectSummary)
-
-
-class TestIntegration(unittest.TestCase):
-    """Integration tests."""
-    
-    def test_full_node_project(self):
-        """Test full Node.js project analysis."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create realistic project structure
-            (Path(tmpdir) / "package.json").write_text(json.dumps({
-                "name": "my-app",
-                "version": "2.0.0",
-                "description": "A sample application",
-                "dependencies": {
-                    "express": "^4.18.0",
-                    "react": "^18.0.0"
-                },
-                "devDependencies": {
-                    "jest": "^29.0.0"
-                }
-            }))
-            
-            (Path(tmpdir) / "README.md").write_text("# My App\n\nA sample application.")
-            
-            src = Path(tmpdir) / "src"
-            src.mkdir()
-            (src / "index.js").write_text('''
-import express from 'express';
-// TODO: Add routes
-const app = express();
-export default app;
-''')
-            
-            synth = ContextSynth(DetailLevel.DETAILED)
-            summary = synth.summarize_project(Path(tmpdir))
-            
-            self.assertEqual(summary.name, "my-app")
-            self.assertEqual(summary.version, "2.0.0")
-            self.assertIn("express", summary.dependencies)
-            self.assertIn("react", summary.dependencies)
-    
-    def test_full_python_project(self):
-        """Test full Python project analysis."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create realistic project structure
-            (Path(tmpdir) / "requirements.txt").write_text("flask>=2.0.0\nrequests\npytest")
-            
-            (Path(tmpdir) / "main.py").write_text('''
-"""Main application module."""
-
-from flask import Flask
-
-# TODO: Add authentication
-
-app = Flask(__name__)
-
-def create_app():
-    """Create and configure the app."""
-    return app
-
-if __name__ == "__main__":
-    app.run()
-''')
-            
-            synth = ContextSynth()
-            summary = synth.summarize_project(Path(tmpdir))
-            
-            self.assertEqual(summary.project_type, ProjectType.PYTHON)
-            self.assertIn("flask", summary.dependencies)
-
-
-class TestVersion(unittest.TestCase):
+        summary = synth.summarize_project(deep_project)
+        
+        assert isinstance(summary, ProjectSummary)
+        assert summary.file_count == 2
+
+
+@pytest.mark.slow
+def test_full_node_project(node_project):
+    """Test full Node.js project analysis."""
+    synth = ContextSynth(DetailLevel.DETAILED)
+    summary = synth.summarize_project(node_project)
+    
+    assert summary.name == "my-app"
+    assert summary.version == "2.0.0"
+    assert "express" in summary.dependencies
+    assert "react" in summary.dependencies
+
+
+@pytest.mark.slow
+def test_full_python_project(python_project, synth):
+    """Test full Python project analysis."""
+    summary = synth.summarize_project(python_project)
+    
+    assert summary.project_type == ProjectType.PYTHON
+    assert "flask" in summary.dependencies
+
+
+class TestVersion:
     """Test version information."""
     
     def test_version_exists(self):
         """Test that version is defined."""
-        self.assertEqual(__version__, "1.0.0")
-
-
-if __name__ == '__main__':
-    unittest.main(verbosity=2)
+        assert __version__ == "1.0.0"